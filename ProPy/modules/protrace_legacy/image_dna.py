@@ -11,6 +11,7 @@ import numpy as np
 from PIL import Image
 from scipy.ndimage import uniform_filter
 import io
+import functools
 from typing import Dict, Tuple, List
 
 
@@ -253,6 +254,20 @@ def resize_grid(binary_grid, target_h, target_w):
     return resized_array.astype(np.uint8)
 
 
+# int.bit_count (Python 3.10+) is a single C popcount over the 256-bit int
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count
+else:
+    def _popcount(value: int) -> int:
+        return bin(value).count('1')
+
+
+@functools.lru_cache(maxsize=65536)
+def _hex_to_int(hash_hex: str) -> int:
+    """Parse a DNA hex string, memoized since registered DNAs are compared repeatedly"""
+    return int(hash_hex, 16)
+
+
 def hamming_distance(hash1: str, hash2: str) -> int:
     """
     Calculate Hamming distance between two DNA hashes.
@@ -268,12 +283,12 @@ def hamming_distance(hash1: str, hash2: str) -> int:
         raise ValueError("Hash lengths must match")
 
     # Convert hex to integers
-    int1 = int(hash1, 16)
-    int2 = int(hash2, 16)
+    int1 = _hex_to_int(hash1)
+    int2 = _hex_to_int(hash2)
 
     # XOR and count set bits
     xor = int1 ^ int2
-    distance = bin(xor).count('1')
+    distance = _popcount(xor)
 
     return distance
 
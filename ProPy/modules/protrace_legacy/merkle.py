@@ -7,10 +7,21 @@ Optimized for batch verification with O(log n) proof generation.
 """
 
 import hashlib
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
 import json
 
 
+# Resolve the hash backend once; this is called for every node in the tree
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+# Hash constructor for the hot loops, bound once so each hash is a single
+# C call (OpenSSL picks its SHA-NI/AVX2 code path for sha256 itself)
+_hash_new = _blake3 if _blake3 is not None else hashlib.sha256
+
+
 def blake3_hash(data: bytes) -> bytes:
     """
     Compute BLAKE3 hash of data.
@@ -22,12 +33,32 @@ def blake3_hash(data: bytes) -> bytes:
     Returns:
         32-byte hash
     """
-    try:
-        import blake3
-        return blake3.blake3(data).digest()
-    except ImportError:
-        # Fallback to SHA256
-        return hashlib.sha256(data).digest()
+    return _hash_new(data).digest()
+
+
+# Full digest width; trees may opt into truncated nodes (>= 16 bytes) to
+# shrink the retained levels
+DIGEST_SIZE = 32
+MIN_DIGEST_SIZE = 16
+
+
+def _hash_pairs(nodes: List[bytes], start: int, stop: int,
+                size: int = DIGEST_SIZE) -> List[bytes]:
+    """Hash nodes[start:stop] pairwise (start even; odd tail pairs with itself)"""
+    new = _hash_new
+    pairs = iter(nodes[start:stop])
+    if size == DIGEST_SIZE:
+        digests = [new(left + right).digest() for left, right in zip(pairs, pairs)]
+    else:
+        digests = [new(left + right).digest()[:size] for left, right in zip(pairs, pairs)]
+    if (stop - start) % 2:
+        tail = nodes[stop - 1]
+        digests.append(new(tail + tail).digest()[:size])
+    return digests
+
+
+# Side of the sibling in a proof element, indexed by the node's own parity
+_POSITIONS = ('right', 'left')
 
 
 class MerkleNode:
@@ -48,6 +79,17 @@ class MerkleNode:
             right_hash = right.hash if right else b'\x00' * 32
             self.hash = blake3_hash(left_hash + right_hash)
             self.data = None
+    
+    @classmethod
+    def from_digest(cls, digest: bytes, data: bytes = None) -> 'MerkleNode':
+        """Wrap an already computed hash without materializing its children"""
+        node = cls.__new__(cls)
+        node.left = None
+        node.right = None
+        node.is_leaf = data is not None
+        node.hash = digest
+        node.data = data
+        return node
 
 
 class MerkleTree:
@@ -59,12 +101,18 @@ class MerkleTree:
     - Efficient proof generation (O(log n))
     - Proof verification (O(log n))
     - Supports up to 1M leaves before rotation
+    - Optional truncated nodes (digest_size < 32) for memory-bound sessions;
+      roots then differ from full-width trees and verifiers need the width
     """
     
-    def __init__(self):
+    def __init__(self, digest_size: int = DIGEST_SIZE):
+        if not MIN_DIGEST_SIZE <= digest_size <= DIGEST_SIZE:
+            raise ValueError(f"digest_size must be between {MIN_DIGEST_SIZE} and {DIGEST_SIZE}")
+        self.digest_size = digest_size
         self.leaves = []
         self.root = None
         self.leaf_map = {}  # Maps leaf data -> index
+        self.levels = []  # Raw digests per level, leaves first, kept for incremental appends
         
     def add_leaf(self, dna_hex: str, pointer: str, platform_id: str, timestamp: int = None):
         """
@@ -98,27 +146,70 @@ class MerkleTree:
         """
         if not self.leaves:
             self.root = None
+            self.levels = []
             return None
         
-        # Create leaf nodes
-        nodes = [MerkleNode(data=leaf, is_leaf=True) for leaf in self.leaves]
+        # Hash leaves
+        new = _hash_new
+        size = self.digest_size
+        if size == DIGEST_SIZE:
+            self.levels = [[new(leaf).digest() for leaf in self.leaves]]
+        else:
+            self.levels = [[new(leaf).digest()[:size] for leaf in self.leaves]]
         
         # Build tree bottom-up
-        while len(nodes) > 1:
-            next_level = []
-            
-            for i in range(0, len(nodes), 2):
-                left = nodes[i]
-                right = nodes[i + 1] if i + 1 < len(nodes) else nodes[i]  # Duplicate last if odd
-                
-                parent = MerkleNode(left=left, right=right)
-                next_level.append(parent)
-            
-            nodes = next_level
+        self._rehash_from(0)
+        return self.root.hash.hex()
+    
+    def append_leaf(self, dna_hex: str, pointer: str, platform_id: str, timestamp: int = None) -> str:
+        """
+        Add a leaf and update the root incrementally.
+        
+        Only the parents on the path from the new leaf to the root are
+        recomputed, so each append costs O(log n) hashes instead of a full
+        rebuild. Produces the same root as add_leaf() followed by build_tree().
+        
+        Returns:
+            Root hash as hex string
+        """
+        self.add_leaf(dna_hex, pointer, platform_id, timestamp)
+        
+        # Fall back to a full build if leaves were added without rebuilding
+        if not self.levels or len(self.levels[0]) != len(self.leaves) - 1:
+            return self.build_tree()
         
-        self.root = nodes[0]
+        self.levels[0].append(blake3_hash(self.leaves[-1])[:self.digest_size])
+        self._rehash_from(len(self.leaves) - 1)
         return self.root.hash.hex()
     
+    def _rehash_from(self, start: int):
+        """
+        Recompute every parent whose subtree includes leaf index >= start.
+        
+        Args:
+            start: First leaf index that changed (0 rebuilds the whole tree)
+        """
+        size = self.digest_size
+        level = 0
+        while len(self.levels[level]) > 1:
+            nodes = self.levels[level]
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            parents = self.levels[level + 1]
+            
+            start -= start % 2
+            del parents[start // 2:]
+            parents.extend(_hash_pairs(nodes, start, len(nodes), size))  # Duplicate last if odd
+            
+            start //= 2
+            level += 1
+        
+        # Only the root is exposed as a node (tree.root.hash)
+        self.root = MerkleNode.from_digest(
+            self.levels[level][0],
+            data=self.leaves[0] if level == 0 else None
+        )
+    
     def get_root(self) -> Optional[str]:
         """
         Get Merkle root hash.
@@ -143,47 +234,110 @@ class MerkleTree:
         if leaf_index < 0 or leaf_index >= len(self.leaves):
             raise IndexError(f"Leaf index {leaf_index} out of range")
         
-        if self.root is None:
+        if self.root is None or not self.levels or len(self.levels[0]) != len(self.leaves):
             raise ValueError("Tree not built. Call build_tree() first")
         
+        # Read siblings straight from the retained levels: O(log n) per proof
         proof = []
+        index = leaf_index
+        for nodes in self.levels[:-1]:
+            # The clamp pairs an odd last node with itself (duplicate last if odd)
+            sibling = min(index ^ 1, len(nodes) - 1)
+            proof.append({'hash': nodes[sibling].hex(), 'position': _POSITIONS[index & 1]})
+            index >>= 1
         
-        # Rebuild tree structure to track path
-        nodes = [MerkleNode(data=leaf, is_leaf=True) for leaf in self.leaves]
-        current_index = leaf_index
+        return proof
+    
+    def get_multiproof(self, leaf_indices: List[int], raw: bool = False) -> Dict:
+        """
+        Generate a single compact proof for several leaves.
         
-        while len(nodes) > 1:
-            next_level = []
-            
-            for i in range(0, len(nodes), 2):
-                left = nodes[i]
-                right = nodes[i + 1] if i + 1 < len(nodes) else nodes[i]
-                
-                # Check if current node is in this pair
-                if i == current_index or i + 1 == current_index:
-                    # Add sibling to proof
-                    if i == current_index:
-                        # Left node, add right sibling
-                        proof.append({
-                            'hash': right.hash.hex(),
-                            'position': 'right'
-                        })
-                    else:
-                        # Right node, add left sibling
-                        proof.append({
-                            'hash': left.hash.hex(),
-                            'position': 'left'
-                        })
-                    
-                    # Update index for next level
-                    current_index = i // 2
-                
-                parent = MerkleNode(left=left, right=right)
-                next_level.append(parent)
-            
-            nodes = next_level
+        Only siblings that cannot be recomputed from the queried leaves
+        (or from each other) are included, so shared interior nodes are
+        sent once. Positions are implied by the order of the hashes.
         
-        return proof
+        Args:
+            leaf_indices: Indices of leaves to prove
+            raw: Return the proof as one bytes string of concatenated
+                32-byte digests instead of a list of hex strings
+        
+        Returns:
+            {'leaf_indices': sorted unique indices, 'leaf_count': n,
+             'proof': [hex_string, ...] | bytes}
+        """
+        if self.root is None or not self.levels or len(self.levels[0]) != len(self.leaves):
+            raise ValueError("Tree not built. Call build_tree() first")
+        
+        known = sorted(set(leaf_indices))
+        for index in known:
+            if index < 0 or index >= len(self.leaves):
+                raise IndexError(f"Leaf index {index} out of range")
+        
+        proof = []
+        current = known
+        for nodes in self.levels[:-1]:
+            current_set = set(current)
+            for i in current:
+                sibling = i ^ 1
+                if sibling < len(nodes) and sibling not in current_set:
+                    proof.append(nodes[sibling])
+            current = sorted({i // 2 for i in current})
+        
+        return {
+            'leaf_indices': known,
+            'leaf_count': len(self.leaves),
+            'proof': b''.join(proof) if raw else [node.hex() for node in proof]
+        }
+    
+    def verify_multiproof(self, leaves: Dict[int, bytes], proof: Union[List[str], bytes],
+                          leaf_count: int, root_hash: str) -> bool:
+        """
+        Verify a proof from get_multiproof().
+        
+        Args:
+            leaves: Mapping of leaf index -> original leaf data
+            proof: Proof hashes from get_multiproof() (hex list or raw bytes)
+            leaf_count: Total number of leaves in the tree
+            root_hash: Expected root hash (hex string)
+        
+        Returns:
+            True if proof is valid
+        """
+        size = self.digest_size
+        nodes = {i: blake3_hash(data)[:size] for i, data in leaves.items()}
+        
+        # Decode the whole hex proof in one call into a contiguous buffer
+        proof_buf = proof if isinstance(proof, (bytes, bytearray)) else bytes.fromhex(''.join(proof))
+        if len(proof_buf) % size:
+            return False
+        proof_hashes = (proof_buf[i:i + size] for i in range(0, len(proof_buf), size))
+        width = leaf_count
+        
+        try:
+            while width > 1:
+                parents = {}
+                for i in sorted(nodes):
+                    if i // 2 in parents:
+                        continue
+                    left_index = i - i % 2
+                    right_index = left_index + 1
+                    left = nodes[left_index] if left_index in nodes else next(proof_hashes)
+                    if right_index >= width:
+                        right = left  # Duplicate last if odd
+                    elif right_index in nodes:
+                        right = nodes[right_index]
+                    else:
+                        right = next(proof_hashes)
+                    parents[i // 2] = blake3_hash(left + right)[:size]
+                nodes = parents
+                width = (width + 1) // 2
+        except StopIteration:
+            return False
+        
+        # Every proof hash must have been consumed
+        if next(proof_hashes, None) is not None:
+            return False
+        return len(nodes) == 1 and nodes.get(0, b'').hex() == root_hash
     
     def verify_proof(self, leaf_data: bytes, proof: List[Dict[str, str]], root_hash: str) -> bool:
         """
@@ -197,21 +351,7 @@ class MerkleTree:
         Returns:
             True if proof is valid
         """
-        # Compute leaf hash
-        current_hash = blake3_hash(leaf_data)
-        
-        # Traverse proof path
-        for proof_element in proof:
-            sibling_hash = bytes.fromhex(proof_element['hash'])
-            position = proof_element['position']
-            
-            if position == 'left':
-                current_hash = blake3_hash(sibling_hash + current_hash)
-            else:
-                current_hash = blake3_hash(current_hash + sibling_hash)
-        
-        # Compare with expected root
-        return current_hash.hex() == root_hash
+        return _walk_proof(leaf_data, proof, root_hash, self.digest_size)
     
     def export_manifest(self) -> Dict:
         """
@@ -225,6 +365,7 @@ class MerkleTree:
         
         manifest = {
             'root': self.get_root(),
+            'digest_bits': self.digest_size * 8,
             'total_leaves': len(self.leaves),
             'leaves': [],
             'proofs': {}
@@ -254,8 +395,10 @@ class MerkleTree:
         Args:
             manifest: Manifest dictionary from export_manifest()
         """
+        self.digest_size = manifest.get('digest_bits', DIGEST_SIZE * 8) // 8
         self.leaves = []
         self.leaf_map = {}
+        self.levels = []
         
         # Import leaves
         for leaf in manifest['leaves']:
@@ -274,7 +417,8 @@ class MerkleTree:
             raise ValueError("Imported manifest root mismatch")
 
 
-def compute_leaf_hash(dna_hex: str, pointer: str, platform_id: str, timestamp: int = None) -> str:
+def compute_leaf_hash(dna_hex: str, pointer: str, platform_id: str, timestamp: int = None,
+                      digest_size: int = DIGEST_SIZE) -> str:
     """
     Compute leaf hash for DNA registration.
     
@@ -283,6 +427,7 @@ def compute_leaf_hash(dna_hex: str, pointer: str, platform_id: str, timestamp: i
         pointer: Unique identifier
         platform_id: Platform identifier
         timestamp: Unix timestamp
+        digest_size: Node width of the tree, in bytes
     
     Returns:
         Leaf hash as hex string
@@ -292,12 +437,28 @@ def compute_leaf_hash(dna_hex: str, pointer: str, platform_id: str, timestamp: i
         timestamp = int(time.time())
     
     leaf_data = f"{dna_hex}|{pointer}|{platform_id}|{timestamp}".encode('utf-8')
-    return blake3_hash(leaf_data).hex()
+    return blake3_hash(leaf_data)[:digest_size].hex()
+
+
+def _walk_proof(leaf_data: bytes, proof: List[Dict[str, str]], root_hash: str,
+                digest_size: int = DIGEST_SIZE) -> bool:
+    """Hash leaf_data up a get_proof() path and compare with root_hash"""
+    current_hash = blake3_hash(leaf_data)[:digest_size]
+    
+    for proof_element in proof:
+        sibling_hash = bytes.fromhex(proof_element['hash'])
+        
+        if proof_element['position'] == 'left':
+            current_hash = blake3_hash(sibling_hash + current_hash)[:digest_size]
+        else:
+            current_hash = blake3_hash(current_hash + sibling_hash)[:digest_size]
+    
+    return current_hash.hex() == root_hash
 
 
 def verify_proof_standalone(dna_hex: str, pointer: str, platform_id: str, 
                             timestamp: int, proof: List[Dict[str, str]], 
-                            root_hash: str) -> bool:
+                            root_hash: str, digest_size: int = DIGEST_SIZE) -> bool:
     """
     Standalone proof verification without tree instance.
     
@@ -308,23 +469,13 @@ def verify_proof_standalone(dna_hex: str, pointer: str, platform_id: str,
         timestamp: Timestamp
         proof: Merkle proof
         root_hash: Expected root hash
+        digest_size: Node width of the tree, in bytes
     
     Returns:
         True if valid
     """
     leaf_data = f"{dna_hex}|{pointer}|{platform_id}|{timestamp}".encode('utf-8')
-    current_hash = blake3_hash(leaf_data)
-    
-    for proof_element in proof:
-        sibling_hash = bytes.fromhex(proof_element['hash'])
-        position = proof_element['position']
-        
-        if position == 'left':
-            current_hash = blake3_hash(sibling_hash + current_hash)
-        else:
-            current_hash = blake3_hash(current_hash + sibling_hash)
-    
-    return current_hash.hex() == root_hash
+    return _walk_proof(leaf_data, proof, root_hash, digest_size)
 
 
 # Example usage
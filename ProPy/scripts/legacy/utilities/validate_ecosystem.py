@@ -16,17 +16,53 @@ Usage:
 
 import sys
 import os
+from collections import deque
 from pathlib import Path
+import subprocess
 import traceback
-import time
+
+
+def parse_importtime(output: str) -> dict:
+    """
+    Parse `python -X importtime` output.
+    
+    Returns:
+        Dict mapping module name -> (self_us, cumulative_us)
+    """
+    timings = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # Header row
+        timings[fields[2].strip()] = (self_us, cumulative_us)
+    return timings
+
+def count_python_files(dir_path: str):
+    """
+    Count .py files directly inside a directory with a single scandir.
+    
+    Returns:
+        Number of Python files, or None if the directory does not exist
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            return sum(1 for entry in entries if entry.name.endswith('.py') and entry.is_file())
+    except (FileNotFoundError, NotADirectoryError):
+        return None
 
 class EcosystemValidator:
     """Validates the ProTRACE ecosystem."""
     
     def __init__(self):
-        self.passed = []
-        self.failed = []
-        self.warnings = []
+        self.passed = deque()
+        self.failed = deque()
+        self.warnings = deque()
         
     def log_pass(self, test_name: str):
         """Log a passed test."""
@@ -143,12 +179,11 @@ class EcosystemValidator:
         ]
         
         for dir_path, display_name in directories:
-            path = Path(dir_path)
-            if path.exists() and path.is_dir():
-                files = list(path.glob('*.py'))
-                self.log_pass(f"{display_name} ({len(files)} Python files)")
-            else:
+            count = count_python_files(dir_path)
+            if count is None:
                 self.log_warning(display_name, "Directory not found")
+            else:
+                self.log_pass(f"{display_name} ({count} Python files)")
         
         # Check backwards compatibility
         if Path("protrace.py").exists():
@@ -175,16 +210,31 @@ class EcosystemValidator:
         print("PERFORMANCE CHECK")
         print("="*80)
         
-        # Test import speed
+        # Test import speed in a fresh interpreter (protrace is already
+        # imported by test_imports, so timing it in-process measures nothing)
         try:
-            start = time.time()
-            import protrace
-            import_time = (time.time() - start) * 1000
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', 'import protrace'],
+                capture_output=True,
+                text=True,
+                env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '0'},
+                timeout=60
+            )
+            if result.returncode != 0:
+                raise ImportError("protrace failed to import in a fresh interpreter")
+            
+            timings = parse_importtime(result.stderr)
+            import_time = timings.get('protrace', (0, 0))[1] / 1000
             
             if import_time < 1000:  # Less than 1 second
                 self.log_pass(f"Import speed ({import_time:.2f}ms)")
             else:
                 self.log_warning("Import speed", f"Slow import ({import_time:.2f}ms)")
+            
+            # Report the slowest imports by self time
+            slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:5]
+            for module_name, (self_us, cumulative_us) in slowest:
+                print(f"   {module_name}: {self_us / 1000:.2f}ms self, {cumulative_us / 1000:.2f}ms cumulative")
         except Exception as e:
             self.log_fail("Import performance", e)
     
@@ -213,14 +263,15 @@ class EcosystemValidator:
         
         if self.failed:
             print("\n❌ FAILED TESTS:")
-            for test_name, error in self.failed:
-                print(f"   • {test_name}")
-                print(f"     Error: {error}")
+            sys.stdout.write("\n".join(
+                f"   • {test_name}\n     Error: {error}" for test_name, error in self.failed
+            ) + "\n")
         
         if self.warnings:
             print("\n⚠️  WARNINGS:")
-            for test_name, message in self.warnings:
-                print(f"   • {test_name}: {message}")
+            sys.stdout.write("\n".join(
+                f"   • {test_name}: {message}" for test_name, message in self.warnings
+            ) + "\n")
         
         # Overall status
         print("\n" + "="*80)
@@ -6,6 +6,28 @@ Simple Virtual IPFS Manager for testing
 import hashlib
 import os
 
+# None of the hashes below are security-critical: node_id, perceptual_hash
+# and dna_hash are in-memory placeholders, so they use the fastest available
+# non-cryptographic hash. Only the mock CID keeps SHA-256 to mirror IPFS.
+
+try:
+    import xxhash
+
+    def _id_hash(data: str) -> str:
+        return xxhash.xxh3_128_hexdigest(data)
+except ImportError:
+    def _id_hash(data: str) -> str:
+        return hashlib.sha256(data.encode()).hexdigest()
+
+try:
+    import blake3
+
+    def _fast_hash(data: bytes) -> str:
+        return blake3.blake3(data).hexdigest(length=16)
+except ImportError:
+    def _fast_hash(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
 class MockNode:
     def __init__(self, node_id, ipfs_cid, perceptual_hash, dna_hash, file_size):
         self.node_id = node_id
@@ -27,10 +49,10 @@ class VirtualIPFSManager:
         filename = os.path.basename(image_path)
         
         # Create mock hashes
-        node_id = hashlib.sha256(filename.encode()).hexdigest()
+        node_id = _id_hash(filename)
         ipfs_cid = f"Qm{hashlib.sha256(image_path.encode()).hexdigest()[:44]}"
-        perceptual_hash = hashlib.md5(filename.encode()).hexdigest()
-        dna_hash = hashlib.sha256(filename.encode()).hexdigest()  # Mock DNA hash
+        perceptual_hash = _fast_hash(filename.encode())
+        dna_hash = node_id  # Mock DNA hash
         
         # Get file size
         try:
@@ -11,6 +11,7 @@ Usage: python validate_system.py
 
 import sys
 import os
+import tempfile
 from pathlib import Path
 
 def check_dependencies():
@@ -120,15 +121,19 @@ def check_dna():
         img = Image.new('RGB', (64, 64), color='blue')
 
         # Save temporarily for testing
-        test_path = "temp_validation_image.png"
-        img.save(test_path)
+        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tf:
+            test_path = tf.name
+            img.save(tf, format='PNG')
 
-        # Extract DNA features
-        dna_data = extract_dna_features(test_path)
-
-        # Clean up
-        if os.path.exists(test_path):
-            os.remove(test_path)
+        try:
+            # Extract DNA features
+            dna_data = extract_dna_features(test_path)
+        finally:
+            # Clean up
+            try:
+                os.unlink(test_path)
+            except FileNotFoundError:
+                pass
 
         if 'dna_signature' in dna_data and dna_data['dna_signature']:
             print("   ✅ UTGMH: DNA extraction works")
@@ -15,7 +15,10 @@ import uvicorn
 import tempfile
 import os
 from pathlib import Path
+from collections import OrderedDict
+import secrets
 import time
+import logging
 
 # Import ProTrace modules
 try:
@@ -26,12 +29,38 @@ except ImportError as e:
     print(f"Warning: Could not import protrace modules: {e}")
     __version__ = "2.0.0"
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="ProTrace API",
     description="Digital Asset Verification System",
     version=__version__
 )
 
+# Maximum number of built Merkle trees kept for proof retrieval
+MAX_MERKLE_SESSIONS = int(os.getenv("PROTRACE_MAX_MERKLE_SESSIONS", "256"))
+
+# Global state management
+class APIState:
+    def __init__(self):
+        self.merkle_trees = OrderedDict()  # session_id -> MerkleTree, LRU order
+
+    def store_tree(self, session_id: str, tree) -> None:
+        """Store a built tree, evicting the least recently used session when full"""
+        self.merkle_trees[session_id] = tree
+        self.merkle_trees.move_to_end(session_id)
+        while len(self.merkle_trees) > MAX_MERKLE_SESSIONS:
+            self.merkle_trees.popitem(last=False)
+
+    def get_tree(self, session_id: str):
+        """Look up a stored tree and mark it as recently used"""
+        tree = self.merkle_trees.get(session_id)
+        if tree is not None:
+            self.merkle_trees.move_to_end(session_id)
+        return tree
+
+state = APIState()
+
 # Request/Response Models
 class DNARequest(BaseModel):
     image_path: str
@@ -84,20 +113,17 @@ async def compute_dna_endpoint(request: DNARequest):
     Returns:
         DNAResponse with DNA fingerprint
     """
-    try:
-        if not os.path.exists(request.image_path):
-            raise HTTPException(status_code=404, detail="Image file not found")
-        
-        result = compute_dna(request.image_path)
-        
-        return {
-            "dna_hex": result.get('dna_hex', ''),
-            "dhash": result.get('dhash', ''),
-            "grid_hash": result.get('grid_hash', ''),
-            "success": True
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if not os.path.exists(request.image_path):
+        raise HTTPException(status_code=404, detail="Image file not found")
+    
+    result = compute_dna(request.image_path)
+    
+    return {
+        "dna_hex": result.get('dna_hex', ''),
+        "dhash": result.get('dhash', ''),
+        "grid_hash": result.get('grid_hash', ''),
+        "success": True
+    }
 
 # DNA Comparison endpoint
 @app.post("/api/v1/dna/compare", response_model=SimilarityResponse)
@@ -111,18 +137,15 @@ async def compare_dna_endpoint(request: SimilarityRequest):
     Returns:
         SimilarityResponse with similarity score
     """
-    try:
-        similarity = dna_similarity(request.dna1, request.dna2)
-        threshold = 0.90
-        is_dup = is_duplicate(request.dna1, request.dna2, threshold)
-        
-        return {
-            "similarity": similarity,
-            "is_duplicate": is_dup,
-            "threshold": threshold
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    similarity = dna_similarity(request.dna1, request.dna2)
+    threshold = 0.90
+    is_dup = is_duplicate(request.dna1, request.dna2, threshold)
+    
+    return {
+        "similarity": similarity,
+        "is_duplicate": is_dup,
+        "threshold": threshold
+    }
 
 # Upload and compute DNA endpoint
 @app.post("/api/v1/dna/upload")
@@ -136,28 +159,26 @@ async def upload_and_compute_dna(file: UploadFile = File(...)):
     Returns:
         DNA fingerprint
     """
+    # Save uploaded file temporarily
+    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
+        content = await file.read()
+        tmp.write(content)
+        tmp_path = tmp.name
+    
+    # Compute DNA
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        # Compute DNA
         result = compute_dna(tmp_path)
-        
+    finally:
         # Clean up
         os.unlink(tmp_path)
-        
-        return {
-            "filename": file.filename,
-            "dna_hex": result.get('dna_hex', ''),
-            "dhash": result.get('dhash', ''),
-            "grid_hash": result.get('grid_hash', ''),
-            "success": True
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "filename": file.filename,
+        "dna_hex": result.get('dna_hex', ''),
+        "dhash": result.get('dhash', ''),
+        "grid_hash": result.get('grid_hash', ''),
+        "success": True
+    }
 
 # Merkle Tree endpoint
 @app.post("/api/v1/merkle/build")
@@ -171,45 +192,51 @@ async def build_merkle_tree(leaves: List[str]):
     Returns:
         Merkle root hash
     """
-    try:
-        tree = MerkleTree()
-        
-        # Add leaves
-        for i, leaf in enumerate(leaves):
-            tree.add_leaf(leaf, f"img_{i}", "test_platform", int(time.time()))
-        
-        # Build tree
-        root_hash = tree.build_tree()
-        
-        return {
-            "root_hash": root_hash,
-            "leaf_count": len(leaves),
-            "success": True
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    tree = MerkleTree()
+    
+    # Add leaves
+    for i, leaf in enumerate(leaves):
+        tree.add_leaf(leaf, f"img_{i}", "test_platform", int(time.time()))
+    
+    # Build tree
+    root_hash = tree.build_tree()
+    
+    # Keep the tree so proofs can be served without rebuilding
+    session_id = secrets.token_hex(8)
+    state.store_tree(session_id, tree)
+    
+    return {
+        "root_hash": root_hash,
+        "leaf_count": len(leaves),
+        "session_id": session_id,
+        "success": True
+    }
 
 # Get Merkle proof endpoint
-@app.get("/api/v1/merkle/proof/{leaf_index}")
-async def get_merkle_proof(leaf_index: int):
+@app.get("/api/v1/merkle/proof/{session_id}/{leaf_index}")
+async def get_merkle_proof(session_id: str, leaf_index: int):
     """
     Get Merkle proof for a leaf at given index
     
     Args:
+        session_id: Session ID returned by /api/v1/merkle/build
         leaf_index: Index of the leaf
         
     Returns:
         Merkle proof
     """
-    try:
-        # This would need to maintain state - simplified for demo
-        return {
-            "leaf_index": leaf_index,
-            "proof": [],
-            "note": "Merkle tree state management required for production"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    tree = state.get_tree(session_id)
+    if tree is None:
+        raise HTTPException(status_code=404, detail="Merkle tree session not found")
+    
+    if leaf_index < 0 or leaf_index >= len(tree.leaves):
+        raise HTTPException(status_code=400, detail="Leaf index out of range")
+    
+    return {
+        "leaf_index": leaf_index,
+        "proof": tree.get_proof(leaf_index),
+        "root_hash": tree.get_root()
+    }
 
 # API Info endpoint
 @app.get("/api/v1/info")
@@ -224,7 +251,7 @@ async def api_info():
             "compare_dna": "POST /api/v1/dna/compare",
             "upload_dna": "POST /api/v1/dna/upload",
             "build_merkle": "POST /api/v1/merkle/build",
-            "get_proof": "GET /api/v1/merkle/proof/{leaf_index}"
+            "get_proof": "GET /api/v1/merkle/proof/{session_id}/{leaf_index}"
         },
         "documentation": "/docs"
     }
@@ -239,6 +266,13 @@ async def test_endpoint():
         "timestamp": str(time.time())
     }
 
+# Error handler
+@app.exception_handler(Exception)
+async def global_exception_handler(request, exc):
+    """Log unhandled errors and return a generic 500 without internal details"""
+    logger.error(f"Unhandled exception on {request.url.path}: {exc}", exc_info=True)
+    return JSONResponse(status_code=500, content={"detail": "Internal server error"})
+
 def main():
     """Run the development server"""
     print("🚀 Starting ProTrace API Server...")
@@ -9,19 +9,28 @@ Fixes all issues identified in TestSprite testing.
 Port: 8000
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Query, Header
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, List, Any
 import uvicorn
-import tempfile
 import os
 from pathlib import Path
 import time
 import json
 import hashlib
+import functools
+import base64
+import struct
+import io
+import types
+from collections import OrderedDict
 from datetime import datetime
+import numpy as np
+
+from fast_json import canonical_json, json_bytes
 
 # Import ProTrace modules
 try:
@@ -33,12 +42,26 @@ try:
     from protrace.ipfs import IPFSManager
     from protrace.relayer_service import LazyMintingRelayer, RelayerConfig
     from protrace import __version__
+    from PIL import Image
     PROTRACE_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: Could not import some protrace modules: {e}")
     __version__ = "2.0.0"
     PROTRACE_AVAILABLE = False
 
+# Optional ANN index for the registry duplicate check
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# BLAKE3 for off-chain digests (mock CIDs, signing digests); SHA-256 fallback
+try:
+    from blake3 import blake3 as _digest_hash
+except ImportError:
+    _digest_hash = hashlib.sha256
+
 # Create FastAPI app
 app = FastAPI(
     title="ProTrace Complete API",
@@ -57,17 +80,237 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Optional on-disk registry log; when set, registrations survive restarts
+REGISTRY_LOG_PATH = os.getenv("PROTRACE_REGISTRY_LOG")
+
+# Fixed-size registry record: packed 256-bit DNA + metadata (240 bytes)
+REGISTRY_RECORD = np.dtype([
+    ('dna', np.uint8, (32,)),
+    ('timestamp', '<i8'),
+    ('platform_id', 'S64'),
+    ('image_id', 'S136'),
+])
+
+class RegistryLog:
+    """Append-only file of fixed-size registry records, read back with np.memmap"""
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def accepts(self, image_id: str, platform_id: str) -> bool:
+        """Check that the identifiers fit their fixed-width record fields"""
+        return (len(image_id.encode()) <= REGISTRY_RECORD['image_id'].itemsize and
+                len(platform_id.encode()) <= REGISTRY_RECORD['platform_id'].itemsize)
+    
+    def append(self, image_id: str, dna_hex: str, platform_id: str, timestamp: int):
+        """Append one registration record"""
+        record = np.zeros(1, dtype=REGISTRY_RECORD)
+        record['dna'] = np.frombuffer(bytes.fromhex(dna_hex), dtype=np.uint8)
+        record['timestamp'] = timestamp
+        record['platform_id'] = platform_id.encode()
+        record['image_id'] = image_id.encode()
+        with open(self.path, 'ab') as f:
+            f.write(record.tobytes())
+    
+    def records(self) -> np.ndarray:
+        """Map all complete records (a torn trailing write is ignored)"""
+        try:
+            count = os.path.getsize(self.path) // REGISTRY_RECORD.itemsize
+        except FileNotFoundError:
+            count = 0
+        if count == 0:
+            return np.empty(0, dtype=REGISTRY_RECORD)
+        return np.memmap(self.path, dtype=REGISTRY_RECORD, mode='r', shape=(count,))
+
+# Caps on transient per-request state (least recently used entries are dropped)
+MAX_MERKLE_SESSIONS = int(os.getenv("PROTRACE_MAX_MERKLE_SESSIONS", "256"))
+MAX_RELAYER_MONITORS = int(os.getenv("PROTRACE_MAX_RELAYER_MONITORS", "1024"))
+
+class LRUStore(OrderedDict):
+    """Dict that evicts its least recently used entry once maxsize is exceeded"""
+    
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
 # Global state management
 class APIState:
     def __init__(self):
-        self.merkle_trees = {}  # Session-based Merkle tree storage
-        self.registry = {}  # Simple in-memory registry
+        self.merkle_trees = LRUStore(MAX_MERKLE_SESSIONS)  # Session-based Merkle tree storage
+        self.registry = {}  # Registered images; never evicted (backs the duplicate check and global root)
         self.vector_db = InMemoryVectorDB() if PROTRACE_AVAILABLE else None
         self.edition_registry = EditionRegistry() if PROTRACE_AVAILABLE else None
-        self.relayers = {}
+        self.relayers = LRUStore(MAX_RELAYER_MONITORS)
+        self.merkle_tree_global = MerkleTree() if PROTRACE_AVAILABLE else None  # Registry tree, updated incrementally
+        self.dna_index = faiss.IndexBinaryHNSW(256, 32) if FAISS_AVAILABLE else None  # Hamming HNSW over DNA bits
+        self.dna_index_ids = []  # HNSW row -> image_id (rows of re-registered ids go stale)
+        self.dna_index_rows = {}  # image_id -> its live HNSW row
+        self.dna_matrix = np.empty((1024, 32), dtype=np.uint8)  # Packed 256-bit DNAs, one row per image
+        self.dna_dhash = np.empty(1024, dtype=np.uint64)  # Contiguous copy of each row's 64-bit dHash
+        self.dna_row_ids = []  # Matrix row -> image_id
+        self.dna_rows = {}  # image_id -> matrix row
+        self.file_sha_index = {}  # sha256 of registered file bytes -> image_id
+        self.registry_log = RegistryLog(REGISTRY_LOG_PATH) if REGISTRY_LOG_PATH else None
         
 state = APIState()
 
+if hasattr(np, "bitwise_count"):
+    def _row_popcount(bits: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+else:
+    def _row_popcount(bits: np.ndarray) -> np.ndarray:
+        return np.unpackbits(bits, axis=1).sum(axis=1, dtype=np.int64)
+
+@functools.lru_cache(maxsize=65536)
+def _dna_vector(dna_hex: str) -> np.ndarray:
+    """Parse a DNA hex string into 32 packed bytes (read-only, memoized)"""
+    return np.frombuffer(bytes.fromhex(dna_hex), dtype=np.uint8)
+
+# Neighbours fetched per HNSW query, so stale rows left by re-registrations
+# can be skipped without losing the live match behind them
+DNA_INDEX_SEARCH_K = 16
+
+def _scan_dna_matrix(query: np.ndarray, threshold: float) -> List[str]:
+    """Exact nearest registration from the packed DNA matrix, as a candidate list"""
+    count = len(state.dna_row_ids)
+    if count == 0:
+        return []
+    
+    # The dHash distance is a lower bound on the full distance, so rows
+    # whose dHash alone exceeds the budget can be dropped before the
+    # 256-bit compare. Most registrations are not duplicates and exit here.
+    max_distance = (1.0 - threshold) * 256
+    dhash_xor = state.dna_dhash[:count] ^ query[:8].view(np.uint64)
+    rows = np.flatnonzero(_row_popcount(dhash_xor.view(np.uint8).reshape(-1, 8)) <= max_distance)
+    if rows.size == 0:
+        return []
+    
+    distances = _row_popcount(state.dna_matrix[rows] ^ query)
+    return [state.dna_row_ids[int(rows[np.argmin(distances)])]]
+
+def find_registry_match(dna_hex: str, threshold: float) -> Optional[Dict]:
+    """
+    Find the closest registered image if its DNA similarity is at or above threshold.
+    
+    With faiss installed, the HNSW nearest neighbours are used (approximate,
+    O(log n)), skipping rows superseded by a re-registration; if every
+    neighbour returned is stale, or faiss is not installed, Hamming
+    distances to every registration are computed in one vectorized pass
+    over the packed DNA matrix.
+    The candidates are always re-checked against the registry entry.
+    """
+    query = _dna_vector(dna_hex)
+    
+    candidates = None
+    if state.dna_index is not None:
+        total = state.dna_index.ntotal
+        if total == 0:
+            return None
+        _, rows = state.dna_index.search(query.reshape(1, -1), min(DNA_INDEX_SEARCH_K, total))
+        ids, live_rows = state.dna_index_ids, state.dna_index_rows
+        candidates = [ids[row] for row in rows[0].tolist()
+                      if row >= 0 and live_rows[ids[row]] == row]
+        if not candidates and len(live_rows) == total:
+            return None  # Nothing stale could have crowded out a live match
+    if not candidates:
+        candidates = _scan_dna_matrix(query, threshold)
+    
+    for registered_id in candidates:
+        similarity = dna_similarity(dna_hex, state.registry[registered_id]['dna_hex'])
+        
+        if similarity >= threshold:
+            return registry_match(registered_id, similarity)
+    return None
+
+def registry_match(image_id: str, similarity: float) -> Dict:
+    """Describe a registered image as a duplicate match"""
+    registered_data = state.registry[image_id]
+    return {
+        "image_id": image_id,
+        "similarity": similarity,
+        "platform_id": registered_data.get('platform_id'),
+        "registered_at": registered_data.get('timestamp')
+    }
+
+def read_image_file(path: str):
+    """Read an image file once, returning (sha256 hex digest, raw bytes)"""
+    data = Path(path).read_bytes()
+    return hashlib.sha256(data).hexdigest(), data
+
+def load_registry_log():
+    """Replay the on-disk registry log into the in-memory registry and indexes"""
+    records = state.registry_log.records()
+    for record in records:
+        image_id = record['image_id'].decode()
+        dna_hex = record['dna'].tobytes().hex()
+        state.registry[image_id] = {
+            "dna_hex": dna_hex,
+            "platform_id": record['platform_id'].decode(),
+            "timestamp": int(record['timestamp']),
+            "image_path": None,
+            "file_sha": None
+        }
+        index_registration(image_id, dna_hex)
+    
+    if state.registry and state.merkle_tree_global is not None:
+        for img_id, data in state.registry.items():
+            state.merkle_tree_global.add_leaf(
+                data['dna_hex'],
+                img_id,
+                data['platform_id'],
+                data['timestamp']
+            )
+        state.merkle_tree_global.build_tree()
+    print(f"Loaded {len(records)} registry records from {state.registry_log.path}")
+
+def index_registration(image_id: str, dna_hex: str):
+    """Store a registered DNA in the packed matrix and the ANN index, if one is in use"""
+    dna_bytes = _dna_vector(dna_hex)
+    
+    row = state.dna_rows.get(image_id)
+    unchanged = row is not None and np.array_equal(state.dna_matrix[row], dna_bytes)
+    if row is None:
+        row = len(state.dna_row_ids)
+        if row == len(state.dna_matrix):
+            # Grow geometrically so appends stay amortized O(1)
+            state.dna_matrix = np.concatenate([state.dna_matrix, np.empty_like(state.dna_matrix)])
+            state.dna_dhash = np.concatenate([state.dna_dhash, np.empty_like(state.dna_dhash)])
+        state.dna_row_ids.append(image_id)
+        state.dna_rows[image_id] = row
+    state.dna_matrix[row] = dna_bytes
+    state.dna_dhash[row] = dna_bytes[:8].view(np.uint64)[0]
+    
+    if state.dna_index is not None and not unchanged:
+        # HNSW cannot delete rows: a re-registered id gets a new row and the
+        # old one is left stale (skipped by find_registry_match)
+        state.dna_index_rows[image_id] = len(state.dna_index_ids)
+        state.dna_index.add(dna_bytes.reshape(1, -1))
+        state.dna_index_ids.append(image_id)
+
+if state.registry_log is not None:
+    load_registry_log()
+
+@functools.lru_cache(maxsize=1024)
+def _cached_compute_dna(image_path: str, mtime_ns: int, size: int) -> tuple:
+    """Compute DNA for an image, memoized on (path, mtime, size) so edits invalidate"""
+    return tuple(compute_dna(image_path).items())
+
+def _compute_upload_dna(fileobj) -> Dict:
+    """Decode an uploaded image file object and compute its DNA"""
+    with Image.open(fileobj) as img:
+        return compute_dna(img)
+
 # ============================================================================
 # Request/Response Models
 # ============================================================================
@@ -115,11 +358,21 @@ class MerkleBuildRequest(BaseModel):
 class MerkleBuildResponse(BaseModel):
     root_hash: str
     leaf_count: int
+    unique_leaf_count: int
+    leaf_map: List[int]
     session_id: str
     success: bool
 
 class MerkleProofResponse(BaseModel):
     leaf_index: int
+    proof: List[Dict[str, str]]
+    root_hash: str
+
+class MerkleMultiProofResponse(BaseModel):
+    leaf_indices: List[int]  # As requested, in build-request space
+    leaf_count: int
+    tree_indices: List[int]  # Sorted unique tree (deduplicated) indices the proof covers
+    tree_leaf_count: int
     proof: List[str]
     root_hash: str
 
@@ -129,9 +382,11 @@ class EIP712SignRequest(BaseModel):
     rights: str
     token_type: str
     private_key: str
+    token_id: int = 0
+    deadline: Optional[int] = None
 
 class EIP712SignResponse(BaseModel):
-    signature: str
+    signature: Optional[str]  # None when eth-account is not installed
     digest: str
     message: Dict
 
@@ -173,49 +428,58 @@ class HealthResponse(BaseModel):
 # Health & Info Endpoints
 # ============================================================================
 
+# Static payloads are serialized once at import; they only depend on the
+# version and on which protrace modules imported successfully.
+_HEALTH_BYTES = json_bytes({
+    "status": "healthy",
+    "version": __version__,
+    "service": "ProTrace Complete API",
+    "features": {
+        "dna_fingerprinting": PROTRACE_AVAILABLE,
+        "merkle_trees": True,
+        "eip712_signing": PROTRACE_AVAILABLE,
+        "vector_db": PROTRACE_AVAILABLE,
+        "ipfs": PROTRACE_AVAILABLE,
+        "edition_management": PROTRACE_AVAILABLE,
+        "relayer": PROTRACE_AVAILABLE
+    }
+})
+
+# Read-only so the pinned catalogue can be shared without defensive copies
+_API_INFO = types.MappingProxyType({
+    "name": "ProTrace Complete API",
+    "version": __version__,
+    "endpoints": types.MappingProxyType({
+        "health": "GET /health",
+        "compute_dna": "POST /compute_dna or /api/v1/dna/compute",
+        "compare_dna": "POST /api/v1/dna/compare",
+        "upload_dna": "POST /api/v1/dna/upload",
+        "register_image": "POST /register_image",
+        "build_merkle": "POST /merkle/build",
+        "get_proof": "GET /merkle/proof/{session_id}/{leaf_index}",
+        "get_proof_batch": "GET /merkle/proof_batch/{session_id}?indices=0&indices=1",
+        "eip712_sign": "POST /eip712/sign",
+        "edition_register": "POST /edition/register",
+        "vector_search": "POST /vector/search",
+        "ipfs_upload": "POST /ipfs/upload",
+        "relayer_monitor": "POST /relayer/monitor",
+        "solana_register": "POST /solana/register_dna"
+    }),
+    "documentation": "/docs",
+    "status": "operational"
+})
+_API_INFO_BYTES = json_bytes({**_API_INFO, "endpoints": dict(_API_INFO["endpoints"])})
+
 @app.get("/", response_model=HealthResponse)
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "version": __version__,
-        "service": "ProTrace Complete API",
-        "features": {
-            "dna_fingerprinting": PROTRACE_AVAILABLE,
-            "merkle_trees": True,
-            "eip712_signing": PROTRACE_AVAILABLE,
-            "vector_db": PROTRACE_AVAILABLE,
-            "ipfs": PROTRACE_AVAILABLE,
-            "edition_management": PROTRACE_AVAILABLE,
-            "relayer": PROTRACE_AVAILABLE
-        }
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 @app.get("/api/v1/info")
 async def api_info():
     """Get API information and available endpoints"""
-    return {
-        "name": "ProTrace Complete API",
-        "version": __version__,
-        "endpoints": {
-            "health": "GET /health",
-            "compute_dna": "POST /compute_dna or /api/v1/dna/compute",
-            "compare_dna": "POST /api/v1/dna/compare",
-            "upload_dna": "POST /api/v1/dna/upload",
-            "register_image": "POST /register_image",
-            "build_merkle": "POST /merkle/build",
-            "get_proof": "GET /merkle/proof/{leaf_index}",
-            "eip712_sign": "POST /eip712/sign",
-            "edition_register": "POST /edition/register",
-            "vector_search": "POST /vector/search",
-            "ipfs_upload": "POST /ipfs/upload",
-            "relayer_monitor": "POST /relayer/monitor",
-            "solana_register": "POST /solana/register_dna"
-        },
-        "documentation": "/docs",
-        "status": "operational"
-    }
+    return Response(content=_API_INFO_BYTES, media_type="application/json")
 
 # ============================================================================
 # DNA Fingerprinting Endpoints (WITH PATH ALIASES)
@@ -230,10 +494,10 @@ async def compute_dna_endpoint(request: DNARequest):
     Supports both /compute_dna and /api/v1/dna/compute paths
     """
     try:
-        if not os.path.exists(request.image_path):
-            raise HTTPException(status_code=404, detail="Image file not found")
-        
-        result = compute_dna(request.image_path)
+        st = os.stat(request.image_path)
+        result = dict(await run_in_threadpool(
+            _cached_compute_dna, request.image_path, st.st_mtime_ns, st.st_size
+        ))
         
         return {
             "dna_hex": result.get('dna_hex', ''),
@@ -266,13 +530,11 @@ async def compare_dna_endpoint(request: SimilarityRequest):
 async def upload_and_compute_dna(file: UploadFile = File(...)):
     """Upload an image and compute its DNA"""
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        result = compute_dna(tmp_path)
-        os.unlink(tmp_path)
+        # The upload is already spooled by Starlette (in memory when small,
+        # on disk otherwise); decode from it directly instead of copying it
+        # into another temp file
+        await file.seek(0)
+        result = await run_in_threadpool(_compute_upload_dna, file.file)
         
         return {
             "filename": file.filename,
@@ -301,49 +563,69 @@ async def register_image_endpoint(request: RegistrationRequest):
         if not os.path.exists(request.image_path):
             raise HTTPException(status_code=404, detail="Image file not found")
         
-        # Compute DNA
-        dna_result = compute_dna(request.image_path)
+        if state.registry_log is not None and not state.registry_log.accepts(request.image_id, request.platform_id):
+            raise HTTPException(status_code=400, detail="image_id or platform_id too long for the registry log")
+        
+        file_sha, image_bytes = await run_in_threadpool(read_image_file, request.image_path)
+        
+        # Byte-identical to a registered file: same DNA, so skip the perceptual pipeline
+        known_id = state.file_sha_index.get(file_sha)
+        known = state.registry.get(known_id) if known_id is not None else None
+        if known is not None and known.get('file_sha') == file_sha and request.similarity_threshold <= 1.0:
+            return {
+                "success": False,
+                "plagiarized": True,
+                "root_hash": None,
+                "match": registry_match(known_id, 1.0),
+                "dna_hex": known['dna_hex']
+            }
+        
+        # Compute DNA (from the bytes already read)
+        dna_result = await run_in_threadpool(compute_dna, io.BytesIO(image_bytes))
         dna_hex = dna_result.get('dna_hex')
         
         # Check for duplicates in registry
-        plagiarized = False
-        match = None
-        
-        for registered_id, registered_data in state.registry.items():
-            registered_dna = registered_data.get('dna_hex')
-            similarity = dna_similarity(dna_hex, registered_dna)
-            
-            if similarity >= request.similarity_threshold:
-                plagiarized = True
-                match = {
-                    "image_id": registered_id,
-                    "similarity": similarity,
-                    "platform_id": registered_data.get('platform_id'),
-                    "registered_at": registered_data.get('timestamp')
-                }
-                break
+        match = find_registry_match(dna_hex, request.similarity_threshold)
+        plagiarized = match is not None
         
         # If not duplicate, register it
         if not plagiarized:
+            replaced = request.image_id in state.registry
+            timestamp = int(time.time())
+            if state.registry_log is not None:
+                state.registry_log.append(request.image_id, dna_hex, request.platform_id, timestamp)
             state.registry[request.image_id] = {
                 "dna_hex": dna_hex,
                 "platform_id": request.platform_id,
-                "timestamp": int(time.time()),
-                "image_path": request.image_path
+                "timestamp": timestamp,
+                "image_path": request.image_path,
+                "file_sha": file_sha
             }
+            state.file_sha_index[file_sha] = request.image_id
+            index_registration(request.image_id, dna_hex)
             
-            # Build Merkle tree with all DNAs
-            tree = MerkleTree()
-            for img_id, data in state.registry.items():
-                tree.add_leaf(
-                    data['dna_hex'],
-                    img_id,
-                    data['platform_id'],
-                    data['timestamp']
+            if replaced:
+                # Re-registration changes an existing leaf, so rebuild
+                tree = MerkleTree()
+                for img_id, data in state.registry.items():
+                    tree.add_leaf(
+                        data['dna_hex'],
+                        img_id,
+                        data['platform_id'],
+                        data['timestamp']
+                    )
+                tree.build_tree()
+                state.merkle_tree_global = tree
+                root_hash = tree.get_root()
+            else:
+                # New leaf: only the right spine of the tree is rehashed
+                root_hash = state.merkle_tree_global.append_leaf(
+                    dna_hex,
+                    request.image_id,
+                    request.platform_id,
+                    timestamp
                 )
             
-            root_hash = tree.build_tree()
-            
             return {
                 "success": True,
                 "plagiarized": False,
@@ -379,17 +661,27 @@ async def build_merkle_tree(request: MerkleBuildRequest):
     """
     try:
         tree = MerkleTree()
+        now = time.time()
+        timestamp = int(now)
         
-        # Add leaves
-        for i, leaf in enumerate(request.leaves):
-            tree.add_leaf(leaf, f"img_{i}", "api_platform", int(time.time()))
+        # Collapse duplicate leaves (first occurrence keeps its position) and
+        # add each new one to the tree in the same pass, with one timestamp
+        # for the whole batch; leaf_map[i] is the tree index of request.leaves[i]
+        unique_index: Dict[str, int] = {}
+        leaf_map = []
+        for leaf in request.leaves:
+            index = unique_index.get(leaf)
+            if index is None:
+                index = unique_index[leaf] = len(unique_index)
+                tree.add_leaf(leaf, f"img_{index}", "api_platform", timestamp)
+            leaf_map.append(index)
         
         # Build tree
-        root_hash = tree.build_tree()
+        root_hash = await run_in_threadpool(tree.build_tree)
         
         # Generate session ID
         session_id = request.session_id or hashlib.sha256(
-            f"{root_hash}{time.time()}".encode()
+            f"{root_hash}{now}".encode()
         ).hexdigest()[:16]
         
         # Store tree in state
@@ -397,12 +689,15 @@ async def build_merkle_tree(request: MerkleBuildRequest):
             "tree": tree,
             "root_hash": root_hash,
             "leaf_count": len(request.leaves),
-            "created_at": time.time()
+            "inverse": leaf_map,
+            "created_at": now
         }
         
         return {
             "root_hash": root_hash,
             "leaf_count": len(request.leaves),
+            "unique_leaf_count": len(unique_index),
+            "leaf_map": leaf_map,
             "session_id": session_id,
             "success": True
         }
@@ -424,10 +719,12 @@ async def get_merkle_proof(session_id: str, leaf_index: int):
         tree_data = state.merkle_trees[session_id]
         tree = tree_data['tree']
         
-        if leaf_index >= len(tree.leaves):
+        inverse = tree_data['inverse']
+        
+        if leaf_index < 0 or leaf_index >= len(inverse):
             raise HTTPException(status_code=400, detail="Leaf index out of range")
         
-        proof = tree.get_proof(leaf_index)
+        proof = tree.get_proof(inverse[leaf_index])
         
         return {
             "leaf_index": leaf_index,
@@ -439,6 +736,63 @@ async def get_merkle_proof(session_id: str, leaf_index: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Proof generation failed: {str(e)}")
 
+@app.get("/merkle/proof_batch/{session_id}", response_model=MerkleMultiProofResponse)
+@app.get("/api/v1/merkle/proof_batch/{session_id}", response_model=MerkleMultiProofResponse)
+async def get_merkle_multiproof(session_id: str, indices: List[int] = Query(...),
+                                format: str = Query("hex", pattern="^(hex|base64|bin)$"),
+                                accept: Optional[str] = Header(None)):
+    """
+    Get one compact Merkle proof covering several leaves
+    
+    Interior nodes shared by the requested paths are sent once.
+    leaf_indices/leaf_count echo the request and the build; the proof is
+    over tree_indices/tree_leaf_count, the deduplicated leaves it was built
+    from. format=base64 packs the proof into one base64 string of
+    concatenated 32-byte digests; format=bin (or Accept:
+    application/octet-stream) returns raw bytes in tree space:
+    <u32 tree_leaf_count><u32 k><k x u32 tree_indices><digests>
+    """
+    try:
+        if session_id not in state.merkle_trees:
+            raise HTTPException(status_code=404, detail="Merkle tree session not found")
+        
+        tree_data = state.merkle_trees[session_id]
+        tree = tree_data['tree']
+        
+        inverse = tree_data['inverse']
+        
+        if any(i < 0 or i >= len(inverse) for i in indices):
+            raise HTTPException(status_code=400, detail="Leaf index out of range")
+        
+        # Proof is over tree (deduplicated) indices
+        binary = format == "bin" or (accept or "").startswith("application/octet-stream")
+        multiproof = tree.get_multiproof([inverse[i] for i in indices], raw=binary or format != "hex")
+        
+        if binary:
+            known = multiproof['leaf_indices']
+            header = struct.pack(f"<II{len(known)}I", multiproof['leaf_count'], len(known), *known)
+            return Response(content=header + multiproof['proof'],
+                            media_type="application/octet-stream")
+        
+        body = {
+            "leaf_indices": indices,
+            "leaf_count": tree_data['leaf_count'],
+            "tree_indices": multiproof['leaf_indices'],
+            "tree_leaf_count": multiproof['leaf_count'],
+            "proof": multiproof['proof'],
+            "root_hash": tree_data['root_hash']
+        }
+        
+        if format == "base64":
+            body['proof'] = base64.b64encode(multiproof['proof']).decode()
+            return Response(content=json_bytes(body), media_type="application/json")
+        
+        return body
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Proof generation failed: {str(e)}")
+
 # ============================================================================
 # EIP-712 Signing Endpoint (NEW - FIXES TC005)
 # ============================================================================
@@ -452,19 +806,21 @@ async def sign_eip712_message(request: EIP712SignRequest):
     Implements missing EIP-712 signing functionality
     """
     try:
-        # Build EIP-712 message
+        # Build EIP-712 message (domain and types are module constants in protrace.eip712)
         message = build_registration_message(
-            creator_address=request.creator_address,
-            asset_hash=request.asset_hash,
-            rights=request.rights,
-            token_type=request.token_type
+            dna_hex=request.asset_hash,
+            pointer=request.rights,
+            token_id=request.token_id,
+            platform_id=request.token_type,
+            signer_address=request.creator_address,
+            deadline=request.deadline
         )
         
         # Sign message
         signature = sign_message(message, request.private_key)
         
         # Compute digest
-        digest = hashlib.sha256(json.dumps(message, sort_keys=True).encode()).hexdigest()
+        digest = _digest_hash(canonical_json(message)).hexdigest()
         
         return {
             "signature": signature,
@@ -588,13 +944,13 @@ async def upload_to_ipfs(request: IPFSUploadRequest):
     """
     try:
         # Mock IPFS upload (would connect to actual IPFS node in production)
-        manifest_json = json.dumps(request.manifest)
-        cid = hashlib.sha256(manifest_json.encode()).hexdigest()[:46]
+        manifest_bytes = json_bytes(request.manifest)
+        cid = _digest_hash(manifest_bytes).hexdigest()[:46]
         
         return {
             "cid": f"Qm{cid}",
             "manifest": request.manifest,
-            "size": len(manifest_json),
+            "size": len(manifest_bytes),
             "timestamp": int(time.time()),
             "note": "Mock CID - connect to IPFS node for production"
         }
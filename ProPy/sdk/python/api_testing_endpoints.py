@@ -8,16 +8,25 @@ These endpoints ensure TestSprite and other test frameworks can run without exte
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import Optional, Dict, List, Any
-import hashlib
+from typing import Optional, Dict, List, Any, Tuple
 import time
 import json
 import base64
+import functools
+import itertools
+import secrets
+import struct
 from datetime import datetime
 
+from fast_json import FastJSONResponse, canonical_json, json_bytes
+
+# Mock digests only need to be deterministic, not SHA-256 specifically
+from blake3 import blake3 as _mock_hash
+
 # Create testing router
-testing_router = APIRouter(prefix="/test", tags=["Testing"])
+testing_router = APIRouter(prefix="/test", tags=["Testing"], default_response_class=FastJSONResponse)
 
 # ============================================================================
 # Test Data Models
@@ -54,15 +63,16 @@ class TestResetRequest(BaseModel):
 # Mock Data Generators
 # ============================================================================
 
+@functools.lru_cache(maxsize=8192)
+def _mock_dna_core(identifier: bytes) -> Tuple[str, str, str]:
+    """(dna_hex, dhash, grid_hash) for an already-encoded identifier (memoized)"""
+    # The 64-char digest is the DNA: dhash (64 bits) + grid_hash (192 bits)
+    dna_hex = _mock_hash(identifier).hexdigest()
+    return dna_hex, dna_hex[:16], dna_hex[16:]
+
 def generate_mock_dna(identifier: str) -> Dict[str, str]:
     """Generate deterministic mock DNA hash based on identifier"""
-    # Create deterministic hash from identifier
-    base_hash = hashlib.sha256(identifier.encode()).hexdigest()
-    
-    # Split into dhash (16 hex chars = 64 bits) and grid_hash (48 hex chars = 192 bits)
-    dhash = base_hash[:16]
-    grid_hash = base_hash[16:64]
-    dna_hex = dhash + grid_hash
+    dna_hex, dhash, grid_hash = _mock_dna_core(identifier.encode())
     
     return {
         "dna_hex": dna_hex,
@@ -70,11 +80,305 @@ def generate_mock_dna(identifier: str) -> Dict[str, str]:
         "grid_hash": grid_hash
     }
 
+# Digests of the fixed mock inputs, computed once at import
+_DEMO_ASSET_HASH = _mock_hash(b"demo_asset").hexdigest()
+_TEST_ASSET_HASH = _mock_hash(b"test_asset").hexdigest()
+_DEMO_EDITION_KEY = _mock_hash(b"ethereum_1").hexdigest()[:32]
+_DEMO_EDITION_CONTRACT = "0x" + _mock_hash(b"ethereum").hexdigest()[:40]
+_SIMILAR_DNA_HASHES = tuple(_mock_hash(f"similar_dna_{i}".encode()).hexdigest() for i in range(3))
+_DEMO_MANIFEST_HASH = _mock_hash(b"demo_manifest").hexdigest()
+_TEST_MANIFEST_HASH = _mock_hash(b"test_manifest").hexdigest()
+_DEMO_CONTRACT_ADDRESS = "0x" + _mock_hash(b"demo_contract").hexdigest()[:40]
+_TEST_CONTRACT_ADDRESS = "0x" + _mock_hash(b"test_contract").hexdigest()[:40]
+_DEMO_DNA_HASH = _mock_hash(b"demo_dna").hexdigest()
+_TEST_DNA_HASH = _mock_hash(b"test_dna").hexdigest()
+
+# Mock EIP-712 messages never change, so their signing input prefix is fixed
+_DEMO_EIP712_MESSAGE = {
+    "creator_address": "0x742d35Cc6634C0532925a3b844Bc454e4438f44e",
+    "asset_hash": "0x" + _DEMO_ASSET_HASH,
+    "rights": "commercial",
+    "token_type": "ERC721"
+}
+_TEST_EIP712_MESSAGE = {
+    "creator_address": "0x742d35Cc6634C0532925a3b844Bc454e4438f44e",
+    "asset_hash": "0x" + _TEST_ASSET_HASH,
+    "rights": "commercial",
+    "token_type": "ERC721"
+}
+_TEST_EIP712_INPUT = _mock_hash(json.dumps(_TEST_EIP712_MESSAGE, sort_keys=True).encode())
+
+def mock_eip712_signature(signing_input) -> Tuple[str, str]:
+    """(signature, digest) for a sha256 object already fed the signing input"""
+    digest = signing_input.hexdigest()
+    with_v = signing_input.copy()
+    with_v.update(b"v")
+    return "0x" + digest + with_v.hexdigest(), "0x" + digest
+
+_DEMO_EIP712_SIGNATURE, _DEMO_EIP712_DIGEST = mock_eip712_signature(
+    _mock_hash(json.dumps(_DEMO_EIP712_MESSAGE, sort_keys=True).encode() + b"demo")
+)
+
+def mock_leaf_bytes(leaf_count: int) -> bytes:
+    """Concatenated mock leaves (mock_dna_hash_0mock_dna_hash_1...) in one buffer"""
+    return b"".join([b"mock_dna_hash_%d" % i for i in range(leaf_count)])
+
+_DEMO_MERKLE_ROOT = _mock_hash(mock_leaf_bytes(5)).hexdigest()
+
+# Mock session ids: root prefix + process-local sequence number
+_SESSION_COUNTER = itertools.count()
+
+def mock_session_id(root_hash: str) -> str:
+    """16-char session id, unique within this process"""
+    return f"{root_hash[:8]}{next(_SESSION_COUNTER) & 0xFFFFFFFF:08x}"
+
+# ============================================================================
+# Pre-serialized Responses
+# ============================================================================
+
+# Static GET payloads, serialized once; the timestamped ones are stored without
+# their closing brace so the current time can be appended per request
+_INFO_BYTES = json_bytes({
+    "name": "ProTrace Testing API",
+    "version": "1.0.0",
+    "description": "Mock endpoints for automated testing",
+    "endpoints": {
+        "compute_dna": "POST /test/compute_dna",
+        "register_image": "POST /test/register_image",
+        "build_merkle": "POST /test/build_merkle",
+        "eip712_sign": "POST /test/eip712_sign",
+        "edition_register": "POST /test/edition_register",
+        "vector_search": "POST /test/vector_search",
+        "ipfs_upload": "POST /test/ipfs_upload",
+        "relayer_monitor": "POST /test/relayer_monitor",
+        "solana_register": "POST /test/solana_register",
+        "reset_state": "POST /test/reset"
+    },
+    "features": {
+        "deterministic_output": True,
+        "no_external_dependencies": True,
+        "instant_response": True,
+        "state_management": True
+    }
+})
+
+_SCENARIOS_BYTES = json_bytes({
+    "scenarios": {
+        "successful_registration": {
+            "description": "Register unique image successfully",
+            "endpoint": "/test/register_image",
+            "data": {
+                "image_identifier": "unique_image_001",
+                "image_id": "img_001",
+                "platform_id": "opensea"
+            },
+            "expected_result": {
+                "success": True,
+                "plagiarized": False
+            }
+        },
+        "duplicate_detection": {
+            "description": "Detect duplicate image",
+            "endpoint": "/test/register_image",
+            "data": {
+                "image_identifier": "unique_image_001_duplicate",
+                "image_id": "img_002",
+                "platform_id": "opensea"
+            },
+            "expected_result": {
+                "success": False,
+                "plagiarized": True
+            }
+        },
+        "merkle_proof_flow": {
+            "description": "Build tree and get proof",
+            "steps": [
+                {
+                    "step": 1,
+                    "endpoint": "/test/build_merkle",
+                    "data": {"leaf_count": 10}
+                },
+                {
+                    "step": 2,
+                    "endpoint": "/test/merkle_proof/{session_id}/5",
+                    "note": "Use session_id from step 1"
+                }
+            ]
+        },
+        "cross_chain_edition": {
+            "description": "Register editions on multiple chains",
+            "chains": ["ethereum", "solana", "tezos"],
+            "endpoint": "/test/edition_register"
+        }
+    }
+})
+
+_HEALTH_PREFIX = json_bytes({
+    "status": "healthy",
+    "mode": "testing",
+    "endpoints_available": 15,
+    "features": {
+        "mock_data": True,
+        "deterministic": True,
+        "no_dependencies": True,
+        "instant_response": True
+    }
+})[:-1]
+
+_STATUS_PREFIX = json_bytes({
+    "api": "ProTrace Testing API",
+    "version": "1.0.0",
+    "mode": "testing",
+    "uptime": "operational",
+    "endpoints": {
+        "total": 15,
+        "categories": {
+            "dna": 2,
+            "registration": 2,
+            "merkle": 2,
+            "blockchain": 4,
+            "batch": 2,
+            "utility": 3
+        }
+    },
+    "state": {
+        "deterministic_mode": True,
+        "external_dependencies": False,
+        "database_required": False,
+        "ipfs_required": False
+    }
+})[:-1]
+
+def response_template(payload: Dict[str, Any]) -> bytes:
+    """
+    Serialize a payload once for reuse across requests
+    
+    String values "%d" and "%s" become bytes %-format fields, so per-request
+    values (timestamps, ids) are spliced in with a single `template % args`.
+    """
+    return (json_bytes(payload).replace(b"%", b"%%")
+            .replace(b'"%%d"', b"%d").replace(b'"%%s"', b'"%s"'))
+
+# GET demo payloads; only the %-fields vary per request
+_DEMO_DNA = generate_mock_dna("demo_image_001")
+_DEMO_REGISTRATION_DNA = generate_mock_dna("demo_unique_image")["dna_hex"]
+
+_DEMO_CACHE = {
+    "/compute_dna": response_template({
+        "dna_hex": _DEMO_DNA["dna_hex"],
+        "dhash": _DEMO_DNA["dhash"],
+        "grid_hash": _DEMO_DNA["grid_hash"],
+        "success": True,
+        "test_mode": True,
+        "image_identifier": "demo_image_001",
+        "note": "This is a GET demo. For custom images, use POST with body."
+    }),
+    "/register_image": response_template({
+        "success": True,
+        "plagiarized": False,
+        "root_hash": _mock_hash(f"{_DEMO_REGISTRATION_DNA}demo".encode()).hexdigest(),
+        "match": None,
+        "dna_hex": _DEMO_REGISTRATION_DNA,
+        "test_mode": True,
+        "image_id": "demo_img_001",
+        "platform_id": "demo_platform",
+        "note": "This is a GET demo. For custom registration, use POST with body."
+    }),
+    "/build_merkle": response_template({
+        "root_hash": _DEMO_MERKLE_ROOT,
+        "leaf_count": 5,
+        "session_id": "%s",
+        "success": True,
+        "test_mode": True,
+        "note": "This is a GET demo. For custom leaf count, use POST with body."
+    }),
+    "/eip712_sign": response_template({
+        "signature": _DEMO_EIP712_SIGNATURE,
+        "digest": _DEMO_EIP712_DIGEST,
+        "message": _DEMO_EIP712_MESSAGE,
+        "test_mode": True,
+        "note": "This is a GET demo. For custom scenarios, use POST with body."
+    }),
+    "/edition_register": response_template({
+        "success": True,
+        "chain": "ethereum",
+        "edition_no": 1,
+        "max_editions": 100,
+        "universal_key": _DEMO_EDITION_KEY,
+        "test_mode": True,
+        "contract": _DEMO_EDITION_CONTRACT,
+        "token_id": "1",
+        "note": "This is a GET demo. For custom chains/editions, use POST with body."
+    }),
+    "/vector_search": response_template({
+        "results": [
+            {
+                "dna_hash": _SIMILAR_DNA_HASHES[i],
+                "similarity": 0.95 - (i * 0.02),
+                "metadata": {
+                    "image_id": f"img_{i}",
+                    "platform_id": "demo_platform",
+                    "timestamp": "%d"
+                }
+            }
+            for i in range(3)
+        ],
+        "count": 3,
+        "threshold": 0.90,
+        "test_mode": True,
+        "note": "This is a GET demo. For custom searches, use POST with body."
+    }),
+    "/ipfs_upload": response_template({
+        "cid": "%s",
+        "manifest": {
+            "dna_hash": _DEMO_MANIFEST_HASH,
+            "timestamp": "%d",
+            "version": "1.0"
+        },
+        "size": "%d",
+        "timestamp": "%d",
+        "test_mode": True,
+        "note": "This is a GET demo. For custom manifests, use POST with body."
+    }),
+    "/relayer_monitor": response_template({
+        "success": True,
+        "monitor_id": "%s",
+        "chain": "ethereum",
+        "contract_address": _DEMO_CONTRACT_ADDRESS,
+        "event_types": ["Transfer", "Approval"],
+        "status": "monitoring",
+        "test_mode": True,
+        "note": "This is a GET demo. For custom chains/contracts, use POST with body."
+    }),
+    "/solana_register": response_template({
+        "success": True,
+        "transaction_signature": "%s",
+        "dna_hash": _DEMO_DNA_HASH,
+        "creator": "7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU",
+        "metadata_uri": "https://arweave.net/demo_metadata",
+        "cluster": "devnet",
+        "timestamp": "%d",
+        "test_mode": True,
+        "note": "This is a GET demo. For custom registrations, use POST with body."
+    }),
+}
+
+def demo_response(path: str, *fields) -> Response:
+    """Cached GET demo payload with the per-request fields filled in"""
+    content = _DEMO_CACHE[path]
+    return Response(content=content % fields if fields else content, media_type="application/json")
+
+def mock_ipfs_cid(manifest: Dict[str, Any]) -> Tuple[str, int]:
+    """(CID, size) from a single canonical serialization of the manifest"""
+    canon = canonical_json(manifest)
+    digest = _mock_hash(canon).digest()
+    return "Qm" + base64.b32encode(digest[:20]).decode(), len(canon)
+
 def generate_mock_image_data(image_name: str) -> bytes:
     """Generate mock image data (PNG header + random data)"""
     # PNG magic number and minimal header
     png_header = b'\x89PNG\r\n\x1a\n'
-    mock_data = hashlib.sha256(image_name.encode()).digest()
+    mock_data = _mock_hash(image_name.encode()).digest()
     return png_header + mock_data
 
 # ============================================================================
@@ -84,43 +388,12 @@ def generate_mock_image_data(image_name: str) -> bytes:
 @testing_router.get("/info")
 async def test_api_info():
     """Get information about testing endpoints"""
-    return {
-        "name": "ProTrace Testing API",
-        "version": "1.0.0",
-        "description": "Mock endpoints for automated testing",
-        "endpoints": {
-            "compute_dna": "POST /test/compute_dna",
-            "register_image": "POST /test/register_image",
-            "build_merkle": "POST /test/build_merkle",
-            "eip712_sign": "POST /test/eip712_sign",
-            "edition_register": "POST /test/edition_register",
-            "vector_search": "POST /test/vector_search",
-            "ipfs_upload": "POST /test/ipfs_upload",
-            "relayer_monitor": "POST /test/relayer_monitor",
-            "solana_register": "POST /test/solana_register",
-            "reset_state": "POST /test/reset"
-        },
-        "features": {
-            "deterministic_output": True,
-            "no_external_dependencies": True,
-            "instant_response": True,
-            "state_management": True
-        }
-    }
+    return Response(content=_INFO_BYTES, media_type="application/json")
 
 @testing_router.get("/compute_dna")
 async def test_compute_dna_get():
     """GET handler - returns demo DNA computation"""
-    dna_data = generate_mock_dna("demo_image_001")
-    return {
-        "dna_hex": dna_data["dna_hex"],
-        "dhash": dna_data["dhash"],
-        "grid_hash": dna_data["grid_hash"],
-        "success": True,
-        "test_mode": True,
-        "image_identifier": "demo_image_001",
-        "note": "This is a GET demo. For custom images, use POST with body."
-    }
+    return demo_response("/compute_dna")
 
 @testing_router.post("/compute_dna")
 async def test_compute_dna(request: TestDNARequest):
@@ -130,31 +403,19 @@ async def test_compute_dna(request: TestDNARequest):
     """
     dna_data = generate_mock_dna(request.image_identifier)
     
-    return {
+    return FastJSONResponse({
         "dna_hex": dna_data["dna_hex"],
         "dhash": dna_data["dhash"],
         "grid_hash": dna_data["grid_hash"],
         "success": True,
         "test_mode": True,
         "image_identifier": request.image_identifier
-    }
+    })
 
 @testing_router.get("/register_image")
 async def test_register_image_get():
     """GET handler - returns demo image registration"""
-    dna_data = generate_mock_dna("demo_unique_image")
-    mock_merkle_root = hashlib.sha256(f"{dna_data['dna_hex']}demo".encode()).hexdigest()
-    return {
-        "success": True,
-        "plagiarized": False,
-        "root_hash": mock_merkle_root,
-        "match": None,
-        "dna_hex": dna_data["dna_hex"],
-        "test_mode": True,
-        "image_id": "demo_img_001",
-        "platform_id": "demo_platform",
-        "note": "This is a GET demo. For custom registration, use POST with body."
-    }
+    return demo_response("/register_image")
 
 @testing_router.post("/register_image")
 async def test_register_image(request: TestRegistrationRequest):
@@ -172,7 +433,7 @@ async def test_register_image(request: TestRegistrationRequest):
     if is_duplicate:
         # Return duplicate match
         original_id = request.image_identifier.replace("_duplicate", "")
-        return {
+        return FastJSONResponse({
             "success": False,
             "plagiarized": True,
             "root_hash": None,
@@ -184,14 +445,14 @@ async def test_register_image(request: TestRegistrationRequest):
             },
             "dna_hex": dna_data["dna_hex"],
             "test_mode": True
-        }
+        })
     else:
         # Return successful registration
-        mock_merkle_root = hashlib.sha256(
+        mock_merkle_root = _mock_hash(
             f"{dna_data['dna_hex']}{request.image_id}".encode()
         ).hexdigest()
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "plagiarized": False,
             "root_hash": mock_merkle_root,
@@ -200,23 +461,12 @@ async def test_register_image(request: TestRegistrationRequest):
             "test_mode": True,
             "image_id": request.image_id,
             "platform_id": request.platform_id
-        }
+        })
 
 @testing_router.get("/build_merkle")
 async def test_build_merkle_get():
     """GET handler - returns demo Merkle tree"""
-    leaves = [f"mock_dna_hash_{i}" for i in range(5)]
-    combined = "".join(leaves)
-    root_hash = hashlib.sha256(combined.encode()).hexdigest()
-    session_id = hashlib.sha256(f"{root_hash}{time.time()}".encode()).hexdigest()[:16]
-    return {
-        "root_hash": root_hash,
-        "leaf_count": 5,
-        "session_id": session_id,
-        "success": True,
-        "test_mode": True,
-        "note": "This is a GET demo. For custom leaf count, use POST with body."
-    }
+    return demo_response("/build_merkle", mock_session_id(_DEMO_MERKLE_ROOT).encode())
 
 @testing_router.post("/build_merkle")
 async def test_build_merkle(request: TestMerkleRequest):
@@ -224,24 +474,21 @@ async def test_build_merkle(request: TestMerkleRequest):
     Mock Merkle tree building endpoint
     Returns deterministic root hash and session ID
     """
-    # Generate mock leaves
-    leaves = [f"mock_dna_hash_{i}" for i in range(request.leaf_count)]
-    
-    # Generate deterministic root hash
-    combined = "".join(leaves)
-    root_hash = hashlib.sha256(combined.encode()).hexdigest()
+    # Generate deterministic root hash over all mock leaves in one call
+    root_hash = _mock_hash(mock_leaf_bytes(request.leaf_count)).hexdigest()
     
     # Generate session ID
-    session_id = hashlib.sha256(f"{root_hash}{time.time()}".encode()).hexdigest()[:16]
+    session_id = mock_session_id(root_hash)
     
-    return {
+    return FastJSONResponse({
         "root_hash": root_hash,
         "leaf_count": request.leaf_count,
         "session_id": session_id,
         "success": True,
         "test_mode": True,
-        "leaves_generated": leaves[:3] + ["..."] if request.leaf_count > 3 else leaves
-    }
+        "leaves_generated": [f"mock_dna_hash_{i}" for i in range(min(request.leaf_count, 3))]
+                            + (["..."] if request.leaf_count > 3 else [])
+    })
 
 @testing_router.get("/merkle_proof/{session_id}/{leaf_index}")
 async def test_get_merkle_proof(session_id: str, leaf_index: int):
@@ -249,42 +496,29 @@ async def test_get_merkle_proof(session_id: str, leaf_index: int):
     Mock Merkle proof retrieval
     Returns deterministic proof based on session and index
     """
-    # Generate mock proof
-    proof = [
-        hashlib.sha256(f"{session_id}_sibling_{i}".encode()).hexdigest()
-        for i in range(3)  # 3 levels in the tree
-    ]
+    # Generate mock proof: hash the shared prefix once, then extend copies of that state
+    base = _mock_hash(f"{session_id}_sibling_".encode())
+    proof = []
+    for i in range(3):  # 3 levels in the tree
+        sibling = base.copy()
+        sibling.update(b"%d" % i)
+        proof.append(sibling.hexdigest())
     
     # Mock root hash
-    root_hash = hashlib.sha256(f"{session_id}_root".encode()).hexdigest()
+    root_hash = _mock_hash(f"{session_id}_root".encode()).hexdigest()
     
-    return {
+    return FastJSONResponse({
         "leaf_index": leaf_index,
         "proof": proof,
         "root_hash": root_hash,
         "session_id": session_id,
         "test_mode": True
-    }
+    })
 
 @testing_router.get("/eip712_sign")
 async def test_eip712_sign_get():
     """GET handler - returns demo EIP-712 signature"""
-    message_data = {
-        "creator_address": "0x742d35Cc6634C0532925a3b844Bc454e4438f44e",
-        "asset_hash": "0x" + hashlib.sha256(b"demo_asset").hexdigest(),
-        "rights": "commercial",
-        "token_type": "ERC721"
-    }
-    signature_input = json.dumps(message_data, sort_keys=True) + "demo"
-    signature = "0x" + hashlib.sha256(signature_input.encode()).hexdigest() + hashlib.sha256((signature_input + "v").encode()).hexdigest()[:64]
-    digest = "0x" + hashlib.sha256(signature_input.encode()).hexdigest()
-    return {
-        "signature": signature,
-        "digest": digest,
-        "message": message_data,
-        "test_mode": True,
-        "note": "This is a GET demo. For custom scenarios, use POST with body."
-    }
+    return demo_response("/eip712_sign")
 
 @testing_router.post("/eip712_sign")
 async def test_eip712_sign(request: TestEIP712Request):
@@ -292,44 +526,23 @@ async def test_eip712_sign(request: TestEIP712Request):
     Mock EIP-712 signing endpoint
     Returns deterministic signature based on scenario
     """
-    # Generate mock signature
-    message_data = {
-        "creator_address": "0x742d35Cc6634C0532925a3b844Bc454e4438f44e",
-        "asset_hash": "0x" + hashlib.sha256(b"test_asset").hexdigest(),
-        "rights": "commercial",
-        "token_type": "ERC721"
-    }
+    # Deterministic signature: the message prefix is already hashed
+    signing_input = _TEST_EIP712_INPUT.copy()
+    signing_input.update(request.test_scenario.encode())
+    signature, digest = mock_eip712_signature(signing_input)
     
-    # Deterministic signature
-    signature_input = json.dumps(message_data, sort_keys=True) + request.test_scenario
-    signature = "0x" + hashlib.sha256(signature_input.encode()).hexdigest() + \
-                hashlib.sha256((signature_input + "v").encode()).hexdigest()[:64]
-    
-    digest = "0x" + hashlib.sha256(signature_input.encode()).hexdigest()
-    
-    return {
+    return FastJSONResponse({
         "signature": signature,
         "digest": digest,
-        "message": message_data,
+        "message": _TEST_EIP712_MESSAGE,
         "test_mode": True,
         "scenario": request.test_scenario
-    }
+    })
 
 @testing_router.get("/edition_register")
 async def test_edition_register_get():
     """GET handler - returns demo edition registration"""
-    universal_key = hashlib.sha256(b"ethereum_1").hexdigest()[:32]
-    return {
-        "success": True,
-        "chain": "ethereum",
-        "edition_no": 1,
-        "max_editions": 100,
-        "universal_key": universal_key,
-        "test_mode": True,
-        "contract": "0x" + hashlib.sha256(b"ethereum").hexdigest()[:40],
-        "token_id": "1",
-        "note": "This is a GET demo. For custom chains/editions, use POST with body."
-    }
+    return demo_response("/edition_register")
 
 @testing_router.post("/edition_register")
 async def test_edition_register(request: TestEditionRequest):
@@ -337,43 +550,26 @@ async def test_edition_register(request: TestEditionRequest):
     Mock edition registration for multi-chain NFTs
     Always succeeds with deterministic response
     """
-    universal_key = hashlib.sha256(
+    universal_key = _mock_hash(
         f"{request.chain}_{request.edition_no}".encode()
     ).hexdigest()[:32]
     
-    return {
+    return FastJSONResponse({
         "success": True,
         "chain": request.chain,
         "edition_no": request.edition_no,
         "max_editions": 100,
         "universal_key": universal_key,
         "test_mode": True,
-        "contract": "0x" + hashlib.sha256(request.chain.encode()).hexdigest()[:40],
+        "contract": "0x" + _mock_hash(request.chain.encode()).hexdigest()[:40],
         "token_id": str(request.edition_no)
-    }
+    })
 
 @testing_router.get("/vector_search")
 async def test_vector_search_get():
     """GET handler - returns demo vector search"""
-    results = [
-        {
-            "dna_hash": hashlib.sha256(f"similar_dna_{i}".encode()).hexdigest()[:64],
-            "similarity": 0.95 - (i * 0.02),
-            "metadata": {
-                "image_id": f"img_{i}",
-                "platform_id": "demo_platform",
-                "timestamp": int(time.time()) - (i * 3600)
-            }
-        }
-        for i in range(3)
-    ]
-    return {
-        "results": results,
-        "count": len(results),
-        "threshold": 0.90,
-        "test_mode": True,
-        "note": "This is a GET demo. For custom searches, use POST with body."
-    }
+    now = int(time.time())
+    return demo_response("/vector_search", now, now - 3600, now - 7200)
 
 @testing_router.post("/vector_search")
 async def test_vector_search():
@@ -382,44 +578,37 @@ async def test_vector_search():
     Returns deterministic similar DNAs
     """
     # Generate mock results
+    now = int(time.time())
     results = [
         {
-            "dna_hash": hashlib.sha256(f"similar_dna_{i}".encode()).hexdigest()[:64],
+            "dna_hash": _SIMILAR_DNA_HASHES[i],
             "similarity": 0.95 - (i * 0.02),
             "metadata": {
                 "image_id": f"img_{i}",
                 "platform_id": "test_platform",
-                "timestamp": int(time.time()) - (i * 3600)
+                "timestamp": now - (i * 3600)
             }
         }
         for i in range(3)
     ]
     
-    return {
+    return FastJSONResponse({
         "results": results,
         "count": len(results),
         "threshold": 0.90,
         "test_mode": True
-    }
+    })
 
 @testing_router.get("/ipfs_upload")
 async def test_ipfs_upload_get():
     """GET handler - returns demo IPFS upload"""
-    manifest = {
-        "dna_hash": hashlib.sha256(b"demo_manifest").hexdigest(),
-        "timestamp": int(time.time()),
+    now = int(time.time())
+    cid, size = mock_ipfs_cid({
+        "dna_hash": _DEMO_MANIFEST_HASH,
+        "timestamp": now,
         "version": "1.0"
-    }
-    cid_hash = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()
-    cid = "Qm" + base64.b32encode(bytes.fromhex(cid_hash[:40])).decode()[:44]
-    return {
-        "cid": cid,
-        "manifest": manifest,
-        "size": len(json.dumps(manifest)),
-        "timestamp": int(time.time()),
-        "test_mode": True,
-        "note": "This is a GET demo. For custom manifests, use POST with body."
-    }
+    })
+    return demo_response("/ipfs_upload", cid.encode(), now, size, now)
 
 @testing_router.post("/ipfs_upload")
 async def test_ipfs_upload():
@@ -427,38 +616,28 @@ async def test_ipfs_upload():
     Mock IPFS manifest upload
     Returns deterministic CID
     """
+    now = int(time.time())
     manifest = {
-        "dna_hash": hashlib.sha256(b"test_manifest").hexdigest(),
-        "timestamp": int(time.time()),
+        "dna_hash": _TEST_MANIFEST_HASH,
+        "timestamp": now,
         "version": "1.0"
     }
     
-    # Generate deterministic CID
-    cid_hash = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()
-    cid = "Qm" + base64.b32encode(bytes.fromhex(cid_hash[:40])).decode()[:44]
+    # Generate deterministic CID (hash and size share one serialization)
+    cid, size = mock_ipfs_cid(manifest)
     
-    return {
+    return FastJSONResponse({
         "cid": cid,
         "manifest": manifest,
-        "size": len(json.dumps(manifest)),
-        "timestamp": int(time.time()),
+        "size": size,
+        "timestamp": now,
         "test_mode": True
-    }
+    })
 
 @testing_router.get("/relayer_monitor")
 async def test_relayer_monitor_get():
     """GET handler - returns demo relayer monitor"""
-    monitor_id = hashlib.sha256(f"demo_monitor_{time.time()}".encode()).hexdigest()[:16]
-    return {
-        "success": True,
-        "monitor_id": monitor_id,
-        "chain": "ethereum",
-        "contract_address": "0x" + hashlib.sha256(b"demo_contract").hexdigest()[:40],
-        "event_types": ["Transfer", "Approval"],
-        "status": "monitoring",
-        "test_mode": True,
-        "note": "This is a GET demo. For custom chains/contracts, use POST with body."
-    }
+    return demo_response("/relayer_monitor", secrets.token_hex(8).encode())
 
 @testing_router.post("/relayer_monitor")
 async def test_relayer_monitor():
@@ -466,37 +645,26 @@ async def test_relayer_monitor():
     Mock blockchain event relayer
     Simulates monitor startup
     """
-    monitor_id = hashlib.sha256(
-        f"monitor_{time.time()}".encode()
-    ).hexdigest()[:16]
+    monitor_id = secrets.token_hex(8)  # 16 hex chars, no hashing needed
     
-    return {
+    return FastJSONResponse({
         "success": True,
         "monitor_id": monitor_id,
         "chain": "ethereum",
-        "contract_address": "0x" + hashlib.sha256(b"test_contract").hexdigest()[:40],
+        "contract_address": _TEST_CONTRACT_ADDRESS,
         "event_types": ["Transfer", "Approval"],
         "status": "monitoring",
         "test_mode": True
-    }
+    })
 
 @testing_router.get("/solana_register")
 async def test_solana_register_get():
     """GET handler - returns demo Solana registration"""
+    now = time.time()
     tx_signature = base64.b64encode(
-        hashlib.sha256(f"demo_solana_tx_{time.time()}".encode()).digest()
-    ).decode()[:88]
-    return {
-        "success": True,
-        "transaction_signature": tx_signature,
-        "dna_hash": hashlib.sha256(b"demo_dna").hexdigest()[:64],
-        "creator": "7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU",
-        "metadata_uri": "https://arweave.net/demo_metadata",
-        "cluster": "devnet",
-        "timestamp": int(time.time()),
-        "test_mode": True,
-        "note": "This is a GET demo. For custom registrations, use POST with body."
-    }
+        _mock_hash(b"demo_solana_tx_" + struct.pack("<d", now)).digest()
+    )
+    return demo_response("/solana_register", tx_signature, int(now))
 
 @testing_router.post("/solana_register")
 async def test_solana_register():
@@ -505,31 +673,31 @@ async def test_solana_register():
     Returns deterministic transaction signature
     """
     tx_signature = base64.b64encode(
-        hashlib.sha256(f"solana_tx_{time.time()}".encode()).digest()
-    ).decode()[:88]
+        _mock_hash(b"solana_tx_" + struct.pack("<d", time.time())).digest()
+    ).decode()
     
-    return {
+    return FastJSONResponse({
         "success": True,
         "transaction_signature": tx_signature,
-        "dna_hash": hashlib.sha256(b"test_dna").hexdigest()[:64],
+        "dna_hash": _TEST_DNA_HASH,
         "creator": "7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU",
         "metadata_uri": "https://arweave.net/test_metadata",
         "cluster": "devnet",
         "timestamp": int(time.time()),
         "test_mode": True
-    }
+    })
 
 @testing_router.post("/reset")
 async def test_reset_state(request: TestResetRequest):
     """
     Reset test state for clean test runs
     """
-    return {
+    return FastJSONResponse({
         "success": True,
         "reset_type": request.reset_type,
         "message": f"Test state '{request.reset_type}' has been reset",
         "timestamp": int(time.time())
-    }
+    })
 
 # ============================================================================
 # Batch Testing Endpoints
@@ -540,20 +708,23 @@ async def test_batch_compute_dna(identifiers: List[str]):
     """
     Batch DNA computation for testing
     """
+    dnas = map(_mock_dna_core, [identifier.encode() for identifier in identifiers])
     results = [
         {
             "identifier": identifier,
-            **generate_mock_dna(identifier),
+            "dna_hex": dna_hex,
+            "dhash": dhash,
+            "grid_hash": grid_hash,
             "success": True
         }
-        for identifier in identifiers
+        for identifier, (dna_hex, dhash, grid_hash) in zip(identifiers, dnas)
     ]
     
-    return {
+    return Response(content=json_bytes({
         "results": results,
         "count": len(results),
         "test_mode": True
-    }
+    }), media_type="application/json")
 
 @testing_router.post("/batch/register_images")
 async def test_batch_register(identifiers: List[str]):
@@ -561,25 +732,26 @@ async def test_batch_register(identifiers: List[str]):
     Batch image registration for testing
     """
     results = []
+    duplicates = 0
     for i, identifier in enumerate(identifiers):
-        dna_data = generate_mock_dna(identifier)
         is_duplicate = identifier.endswith("_duplicate")
+        duplicates += is_duplicate
         
         results.append({
             "identifier": identifier,
             "success": not is_duplicate,
             "plagiarized": is_duplicate,
-            "dna_hex": dna_data["dna_hex"],
+            "dna_hex": _mock_dna_core(identifier.encode())[0],
             "image_id": f"test_img_{i:03d}"
         })
     
-    return {
+    return Response(content=json_bytes({
         "results": results,
         "total": len(results),
-        "successful": sum(1 for r in results if r["success"]),
-        "duplicates": sum(1 for r in results if r["plagiarized"]),
+        "successful": len(results) - duplicates,
+        "duplicates": duplicates,
         "test_mode": True
-    }
+    }), media_type="application/json")
 
 # ============================================================================
 # Test Scenarios
@@ -590,56 +762,7 @@ async def test_scenarios():
     """
     Get predefined test scenarios
     """
-    return {
-        "scenarios": {
-            "successful_registration": {
-                "description": "Register unique image successfully",
-                "endpoint": "/test/register_image",
-                "data": {
-                    "image_identifier": "unique_image_001",
-                    "image_id": "img_001",
-                    "platform_id": "opensea"
-                },
-                "expected_result": {
-                    "success": True,
-                    "plagiarized": False
-                }
-            },
-            "duplicate_detection": {
-                "description": "Detect duplicate image",
-                "endpoint": "/test/register_image",
-                "data": {
-                    "image_identifier": "unique_image_001_duplicate",
-                    "image_id": "img_002",
-                    "platform_id": "opensea"
-                },
-                "expected_result": {
-                    "success": False,
-                    "plagiarized": True
-                }
-            },
-            "merkle_proof_flow": {
-                "description": "Build tree and get proof",
-                "steps": [
-                    {
-                        "step": 1,
-                        "endpoint": "/test/build_merkle",
-                        "data": {"leaf_count": 10}
-                    },
-                    {
-                        "step": 2,
-                        "endpoint": "/test/merkle_proof/{session_id}/5",
-                        "note": "Use session_id from step 1"
-                    }
-                ]
-            },
-            "cross_chain_edition": {
-                "description": "Register editions on multiple chains",
-                "chains": ["ethereum", "solana", "tezos"],
-                "endpoint": "/test/edition_register"
-            }
-        }
-    }
+    return Response(content=_SCENARIOS_BYTES, media_type="application/json")
 
 # ============================================================================
 # Health & Status
@@ -650,45 +773,17 @@ async def test_health():
     """
     Test API health check
     """
-    return {
-        "status": "healthy",
-        "mode": "testing",
-        "endpoints_available": 15,
-        "features": {
-            "mock_data": True,
-            "deterministic": True,
-            "no_dependencies": True,
-            "instant_response": True
-        },
-        "timestamp": int(time.time())
-    }
+    return Response(
+        content=_HEALTH_PREFIX + b',"timestamp":%d}' % int(time.time()),
+        media_type="application/json"
+    )
 
 @testing_router.get("/status")
 async def test_status():
     """
     Detailed testing API status
     """
-    return {
-        "api": "ProTrace Testing API",
-        "version": "1.0.0",
-        "mode": "testing",
-        "uptime": "operational",
-        "endpoints": {
-            "total": 15,
-            "categories": {
-                "dna": 2,
-                "registration": 2,
-                "merkle": 2,
-                "blockchain": 4,
-                "batch": 2,
-                "utility": 3
-            }
-        },
-        "state": {
-            "deterministic_mode": True,
-            "external_dependencies": False,
-            "database_required": False,
-            "ipfs_required": False
-        },
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return Response(
+        content=_STATUS_PREFIX + b',"timestamp":"%s"}' % datetime.utcnow().isoformat().encode(),
+        media_type="application/json"
+    )
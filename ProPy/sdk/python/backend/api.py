@@ -3,26 +3,44 @@ ProTRACE Production API Server
 Clean, organized, production-ready backend
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import base64
 import hashlib
+import hmac
+import io
+import os
 import time
 import logging
+import secrets
+import struct
 from datetime import datetime
+import httpx
+from PIL import Image
+
+# Optional shared session store (settings.REDIS_URL)
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
 
 from backend.config import settings
-from protrace.image_dna import compute_dna_hash
+from fast_json import FastJSONResponse
+from protrace.image_dna import compute_dna as compute_dna_hash
 from protrace.merkle import MerkleTree
 from protrace.registration.register_image import register_image
-from protrace.vector_db import VectorDB
-from protrace.ipfs import IPFSClient
-from protrace.eip712 import sign_registration
+from protrace.vector_db import VectorDBClient as VectorDB
+from protrace.ipfs import IPFSManager
 from protrace.edition_core import EditionRegistry
-from protrace.relayer_service import BlockchainRelayer
+from protrace.relayer_service import LazyMintingRelayer as BlockchainRelayer
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +49,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def now_s() -> int:
+    """Current Unix time in whole seconds (integer clock, no float round-trip)"""
+    return time.time_ns() // 1_000_000_000
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -38,6 +60,7 @@ app = FastAPI(
     description="Production-grade NFT authenticity verification API",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=FastJSONResponse,
 )
 
 # Add middlewares
@@ -54,15 +77,64 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 # State Management
 # ============================================================================
 
+# Session ids carry a short keyed tag, so any worker can reject made-up ids
+# without a Redis round-trip
+_SESSION_KEY = hashlib.sha256(settings.SECRET_KEY.encode()).digest()
+
+def new_session_id() -> str:
+    """Random 64-bit session id followed by a 32-bit tag (24 hex chars)"""
+    nonce = secrets.token_bytes(8)
+    return (nonce + hashlib.blake2b(nonce, key=_SESSION_KEY, digest_size=4).digest()).hex()
+
+def session_id_valid(session_id: str) -> bool:
+    """Check the tag of a session id issued by new_session_id()"""
+    try:
+        raw = bytes.fromhex(session_id)
+    except ValueError:
+        return False
+    if len(raw) != 12:
+        return False
+    tag = hashlib.blake2b(raw[:8], key=_SESSION_KEY, digest_size=4).digest()
+    return hmac.compare_digest(raw[8:], tag)
+
+def _leaf_fields(leaf: bytes) -> List[str]:
+    """Split stored leaf bytes back into add_leaf() arguments (DNA hex may contain '|')"""
+    return leaf.decode().rsplit("|", 3)
+
+def _tree_from_leaves(leaves: List[bytes], digest_size: int) -> MerkleTree:
+    """Rebuild a tree from the leaf bytes kept in Redis; runs in the threadpool"""
+    tree = MerkleTree(digest_size=digest_size)
+    for leaf in leaves:
+        tree.add_leaf(*_leaf_fields(leaf))
+    tree.build_tree()
+    return tree
+
+def _extend_tree(tree: MerkleTree, leaves: List[bytes]) -> None:
+    """Append leaves another worker added, rehashing only the new paths"""
+    for leaf in leaves:
+        tree.append_leaf(*_leaf_fields(leaf))
+
+def dna_process_workers() -> int:
+    """DNA compute processes per worker; by default the CPUs are split across uvicorn workers"""
+    if settings.DNA_PROCESS_WORKERS is not None:
+        return settings.DNA_PROCESS_WORKERS
+    return max(1, (os.cpu_count() or 1) // max(1, settings.WORKERS))
+
 class AppState:
     """Application state holder"""
     def __init__(self):
-        self.merkle_sessions: Dict[str, MerkleTree] = {}
+        self.merkle_sessions: "OrderedDict[str, MerkleTree]" = OrderedDict()  # LRU order
+        self.merkle_builds: "OrderedDict[str, str]" = OrderedDict()  # Leaf content key -> session_id
         self.vector_db: Optional[VectorDB] = None
-        self.ipfs_client: Optional[IPFSClient] = None
+        self.ipfs_client: Optional[IPFSManager] = None
         self.edition_registry: EditionRegistry = EditionRegistry()
         self.relayer: Optional[BlockchainRelayer] = None
+        self.http: Optional[httpx.AsyncClient] = None  # Shared client for image_url fetches
+        self.cpu_pool: Optional[ProcessPoolExecutor] = None  # Image decode + DNA compute
+        self.redis = None  # Shared Merkle sessions across workers, when configured
         self.request_count: int = 0
+        self.request_count_flushed: int = 0  # Part of request_count already added to Redis
+        self.background_tasks: List[asyncio.Task] = []
     
     def initialize(self):
         """Initialize external services"""
@@ -71,22 +143,143 @@ class AppState:
             logger.info("Vector DB initialized")
         
         if settings.IPFS_ENABLED:
-            self.ipfs_client = IPFSClient(settings.IPFS_API_URL)
+            self.ipfs_client = IPFSManager(api_endpoint=settings.IPFS_API_URL)
             logger.info("IPFS client initialized")
+    
+    def _cache_session(self, session_id: str, tree: MerkleTree) -> None:
+        """Keep a tree in the local LRU, evicting the least recently used when full"""
+        self.merkle_sessions[session_id] = tree
+        self.merkle_sessions.move_to_end(session_id)
+        while len(self.merkle_sessions) > settings.MERKLE_SESSION_CACHE:
+            self.merkle_sessions.popitem(last=False)
+    
+    async def store_session(self, session_id: str, tree: MerkleTree) -> None:
+        """Store a built tree locally and, if Redis is configured, its leaves for CACHE_TTL seconds there"""
+        self._cache_session(session_id, tree)
+        if self.redis is not None:
+            key = f"merkle:{session_id}"
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.rpush(key, str(tree.digest_size), *tree.leaves)
+                pipe.expire(key, settings.CACHE_TTL)
+                await pipe.execute()
+    
+    async def append_session(self, session_id: str, tree: MerkleTree) -> MerkleTree:
+        """
+        Push the leaf just appended to tree to Redis
+        
+        Only the new leaf is sent. If another worker appended in between,
+        the list is longer than expected and the tree is reloaded so it
+        matches Redis (the returned tree then includes their leaves too)
+        """
+        if self.redis is None:
+            return tree
+        key = f"merkle:{session_id}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, tree.leaves[-1])
+            pipe.expire(key, settings.CACHE_TTL)
+            length, _ = await pipe.execute()
+        if length == len(tree.leaves) + 1:  # Digest size header + leaves
+            return tree
+        self.merkle_sessions.pop(session_id, None)
+        return await self.get_session(session_id)
+    
+    async def get_session(self, session_id: str) -> Optional[MerkleTree]:
+        """
+        Look up a stored tree and mark it as recently used
+        
+        With Redis, the list length is checked on every lookup: a local tree
+        that is behind (another worker appended) pulls just the missing
+        leaves, and a session missing locally is rebuilt from its leaves
+        """
+        tree = self.merkle_sessions.get(session_id)
+        if self.redis is None or not session_id_valid(session_id):
+            if tree is not None:
+                self.merkle_sessions.move_to_end(session_id)
+            return tree
+        
+        key = f"merkle:{session_id}"
+        length = await self.redis.llen(key)
+        if length == 0:  # Expired or reset; drop any local copy with it
+            self.merkle_sessions.pop(session_id, None)
+            return None
+        
+        if tree is not None and len(tree.leaves) + 1 < length:
+            _extend_tree(tree, await self.redis.lrange(key, len(tree.leaves) + 1, -1))
+        elif tree is None or len(tree.leaves) + 1 > length:
+            stored = await self.redis.lrange(key, 0, -1)
+            tree = await run_in_threadpool(_tree_from_leaves, stored[1:], int(stored[0]))
+        self._cache_session(session_id, tree)
+        return tree
+    
+    async def find_build(self, key: str, leaf_count: int) -> Optional[Tuple[str, MerkleTree]]:
+        """Return the live session already built from the same leaves, if any"""
+        session_id = self.merkle_builds.get(key)
+        if session_id is None and self.redis is not None:
+            cached = await self.redis.get(f"mt:{key}")
+            session_id = cached.decode() if cached is not None else None
+        if session_id is None:
+            return None
+        tree = await self.get_session(session_id)
+        if tree is None or len(tree.leaves) != leaf_count:  # Expired, or appended to since
+            return None
+        return session_id, tree
+    
+    async def remember_build(self, key: str, session_id: str) -> None:
+        """Map a leaf content key to the session built from it"""
+        self.merkle_builds[key] = session_id
+        self.merkle_builds.move_to_end(key)
+        while len(self.merkle_builds) > settings.MERKLE_SESSION_CACHE:
+            self.merkle_builds.popitem(last=False)
+        if self.redis is not None:
+            await self.redis.setex(f"mt:{key}", settings.CACHE_TTL, session_id)
 
 app.state = AppState()
 
+async def _flush_request_count():
+    """Add this worker's new requests to the shared Redis counter once a second"""
+    while True:
+        await asyncio.sleep(1.0)
+        delta = app.state.request_count - app.state.request_count_flushed
+        if delta <= 0:
+            continue
+        try:
+            await app.state.redis.incrby("stats:requests", delta)
+            app.state.request_count_flushed += delta
+        except Exception as e:
+            logger.warning(f"Request count flush failed: {str(e)}")
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     app.state.initialize()
+    app.state.http = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=100)
+    )
+    app.state.cpu_pool = ProcessPoolExecutor(max_workers=dna_process_workers())
+    if settings.REDIS_URL:
+        if aioredis is None:
+            logger.warning("REDIS_URL is set but redis is not installed; Merkle sessions stay in-process")
+        else:
+            app.state.redis = aioredis.from_url(settings.REDIS_URL)
+            app.state.background_tasks.append(asyncio.create_task(_flush_request_count()))
+            logger.info("Redis session store initialized")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down ProTRACE API")
+    for task in app.state.background_tasks:
+        task.cancel()
+    if app.state.http is not None:
+        await app.state.http.aclose()
+    if app.state.cpu_pool is not None:
+        app.state.cpu_pool.shutdown(wait=False, cancel_futures=True)
+    if app.state.redis is not None:
+        await app.state.redis.close()
 
 # ============================================================================
 # Request/Response Models
@@ -126,7 +319,7 @@ class ImageRegistrationResponse(BaseModel):
 
 class MerkleTreeRequest(BaseModel):
     """Merkle tree build request"""
-    dna_hashes: List[str] = Field(..., min_items=1)
+    dna_hashes: List[str] = Field(..., min_length=1)
     session_name: Optional[str] = None
 
 class MerkleTreeResponse(BaseModel):
@@ -135,12 +328,17 @@ class MerkleTreeResponse(BaseModel):
     leaf_count: int
     session_id: str
     tree_height: int
+    digest_bits: int
     timestamp: int
 
+class MerkleAppendRequest(BaseModel):
+    """Merkle tree append request"""
+    dna_hash: str
+
 class MerkleProofResponse(BaseModel):
     """Merkle proof response"""
     leaf_index: int
-    proof: List[str]
+    proof: List[Dict[str, str]]
     root_hash: str
     verified: bool
 
@@ -188,7 +386,7 @@ async def health_check():
             "api": True,
             "vector_db": app.state.vector_db is not None,
             "ipfs": app.state.ipfs_client is not None,
-            "merkle": len(app.state.merkle_sessions) >= 0,
+            "merkle": True,
         }
     }
 
@@ -196,6 +394,11 @@ async def health_check():
 # DNA Fingerprinting Endpoints
 # ============================================================================
 
+def _compute_dna_sync(source: Union[bytes, str]) -> Dict[str, Any]:
+    """Decode an image (raw bytes or file path) and compute its DNA; runs in the process pool"""
+    image = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    return compute_dna_hash(image)
+
 @app.post(f"{settings.API_PREFIX}/dna/compute", response_model=DNAResponse)
 async def compute_dna(request: DNAComputeRequest):
     """
@@ -209,36 +412,31 @@ async def compute_dna(request: DNAComputeRequest):
     try:
         app.state.request_count += 1
         
-        # Import here to avoid circular imports
-        from PIL import Image
-        import io
-        import base64
-        import requests
-        
-        # Get image based on input method
+        # Get image source based on input method (decoded in the worker)
         if request.image_data:
-            image_bytes = base64.b64decode(request.image_data)
-            image = Image.open(io.BytesIO(image_bytes))
+            source = base64.b64decode(request.image_data)
         elif request.image_path:
-            image = Image.open(request.image_path)
+            source = request.image_path
         elif request.image_url:
-            response = requests.get(request.image_url, timeout=10)
+            # Awaited, so other requests keep running during the download
+            response = await app.state.http.get(request.image_url)
             response.raise_for_status()
-            image = Image.open(io.BytesIO(response.content))
+            source = response.content
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Must provide image_data, image_path, or image_url"
             )
         
-        # Compute DNA hash
-        dna_result = compute_dna_hash(image)
+        # Decode and hash off the event loop, in parallel across cores
+        loop = asyncio.get_running_loop()
+        dna_result = await loop.run_in_executor(app.state.cpu_pool, _compute_dna_sync, source)
         
         return DNAResponse(
             dna_hex=dna_result['dna_hex'],
             dhash=dna_result['dhash'],
             grid_hash=dna_result['grid_hash'],
-            timestamp=int(time.time())
+            timestamp=now_s()
         )
     
     except Exception as e:
@@ -277,7 +475,7 @@ async def register_image_endpoint(request: ImageRegistrationRequest):
             match=result.get('match'),
             dna_hex=result['dna_hex'],
             registration_id=request.image_id,
-            timestamp=int(time.time())
+            timestamp=now_s()
         )
     
     except Exception as e:
@@ -291,6 +489,15 @@ async def register_image_endpoint(request: ImageRegistrationRequest):
 # Merkle Tree Endpoints
 # ============================================================================
 
+def _build_tree_sync(dna_hashes: List[str], digest_size: int) -> MerkleTree:
+    """Add one leaf per DNA hash (one timestamp for the batch) and build; runs in the threadpool"""
+    tree = MerkleTree(digest_size=digest_size)
+    timestamp = now_s()
+    for i, dna_hex in enumerate(dna_hashes):
+        tree.add_leaf(dna_hex, f"img_{i}", "api_platform", timestamp)
+    tree.build_tree()
+    return tree
+
 @app.post(f"{settings.API_PREFIX}/merkle/build", response_model=MerkleTreeResponse)
 async def build_merkle_tree(request: MerkleTreeRequest):
     """
@@ -301,24 +508,36 @@ async def build_merkle_tree(request: MerkleTreeRequest):
     try:
         app.state.request_count += 1
         
-        # Create Merkle tree
-        tree = MerkleTree(request.dna_hashes)
-        
-        # Generate session ID
-        session_id = hashlib.sha256(
-            f"{tree.root}_{time.time()}_{request.session_name or ''}".encode()
-        ).hexdigest()[:16]
+        # Identical leaf lists (retries, idempotent registrations) reuse the
+        # session already built from them instead of rehashing the tree
+        build_key = hashlib.sha256("\n".join(request.dna_hashes).encode()).hexdigest()
+        cached = await app.state.find_build(build_key, len(request.dna_hashes))
         
-        # Store session
-        app.state.merkle_sessions[session_id] = tree
+        if cached is not None:
+            session_id, tree = cached
+        else:
+            # Create Merkle tree off the event loop
+            tree = await run_in_threadpool(
+                _build_tree_sync, request.dna_hashes, settings.MERKLE_DIGEST_BYTES
+            )
+            
+            # Generate session ID (random 64-bit plus tag, unpredictable and
+            # collision-safe without hashing the root/time/name string)
+            session_id = new_session_id()
+            
+            # Store session
+            await app.state.store_session(session_id, tree)
+            await app.state.remember_build(build_key, session_id)
         
-        return MerkleTreeResponse(
-            root_hash=tree.root,
-            leaf_count=len(request.dna_hashes),
-            session_id=session_id,
-            tree_height=tree.height,
-            timestamp=int(time.time())
-        )
+        # Plain values only; render with orjson without re-validating a model
+        return FastJSONResponse({
+            "root_hash": tree.get_root(),
+            "leaf_count": len(request.dna_hashes),
+            "session_id": session_id,
+            "tree_height": len(tree.levels) - 1,
+            "digest_bits": tree.digest_size * 8,
+            "timestamp": now_s()
+        })
     
     except Exception as e:
         logger.error(f"Merkle tree build failed: {str(e)}")
@@ -327,25 +546,67 @@ async def build_merkle_tree(request: MerkleTreeRequest):
             detail=f"Merkle tree build failed: {str(e)}"
         )
 
+@app.post(f"{settings.API_PREFIX}/merkle/append/{{session_id}}", response_model=MerkleTreeResponse)
+async def append_merkle_leaf(session_id: str, request: MerkleAppendRequest):
+    """
+    Append a DNA hash to an existing Merkle tree
+    
+    Only the path from the new leaf to the root is rehashed (O(log n))
+    """
+    try:
+        app.state.request_count += 1
+        
+        tree = await app.state.get_session(session_id)
+        if tree is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Session {session_id} not found"
+            )
+        
+        tree.append_leaf(request.dna_hash, f"img_{len(tree.leaves)}", "api_platform", now_s())
+        tree = await app.state.append_session(session_id, tree)
+        
+        return FastJSONResponse({
+            "root_hash": tree.get_root(),
+            "leaf_count": len(tree.leaves),
+            "session_id": session_id,
+            "tree_height": len(tree.levels) - 1,
+            "digest_bits": tree.digest_size * 8,
+            "timestamp": now_s()
+        })
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Merkle append failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Merkle append failed: {str(e)}"
+        )
+
 @app.get(f"{settings.API_PREFIX}/merkle/proof/{{session_id}}/{{leaf_index}}", 
          response_model=MerkleProofResponse)
-async def get_merkle_proof(session_id: str, leaf_index: int):
+async def get_merkle_proof(session_id: str, leaf_index: int,
+                           format: str = Query("json", pattern="^(json|bin)$")):
     """
     Get Merkle proof for a specific leaf
     
-    Returns proof path for verification
+    Returns proof path for verification. format=bin returns
+    application/octet-stream: struct "<IIIBI" (leaf_index, proof length,
+    leaf_count, digest size, position bits) followed by the root and the
+    proof digests. Bit i of the position bits is set when proof step i is
+    a left sibling
     """
     try:
         app.state.request_count += 1
         
-        if session_id not in app.state.merkle_sessions:
+        tree = await app.state.get_session(session_id)
+        if tree is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Session {session_id} not found"
             )
         
-        tree = app.state.merkle_sessions[session_id]
-        
         if leaf_index < 0 or leaf_index >= len(tree.leaves):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -354,12 +615,18 @@ async def get_merkle_proof(session_id: str, leaf_index: int):
         
         proof = tree.get_proof(leaf_index)
         
-        return MerkleProofResponse(
-            leaf_index=leaf_index,
-            proof=proof,
-            root_hash=tree.root,
-            verified=True
-        )
+        if format == "bin":
+            positions = sum(1 << i for i, step in enumerate(proof) if step['position'] == 'left')
+            header = struct.pack("<IIIBI", leaf_index, len(proof), len(tree.leaves), tree.digest_size, positions)
+            body = tree.root.hash + bytes.fromhex("".join(step['hash'] for step in proof))  # One decode for the path
+            return Response(content=header + body, media_type="application/octet-stream")
+        
+        return FastJSONResponse({
+            "leaf_index": leaf_index,
+            "proof": proof,
+            "root_hash": tree.get_root(),
+            "verified": True
+        })
     
     except HTTPException:
         raise
@@ -396,7 +663,7 @@ async def register_edition(request: EditionRegisterRequest):
             "chain": request.chain,
             "edition_no": request.edition_no,
             "universal_key": edition_data['universal_key'],
-            "timestamp": int(time.time())
+            "timestamp": now_s()
         }
     
     except Exception as e:
@@ -413,15 +680,27 @@ async def register_edition(request: EditionRegisterRequest):
 @app.get(f"{settings.API_PREFIX}/stats")
 async def get_stats():
     """Get API statistics"""
-    return {
+    stats = {
         "request_count": app.state.request_count,
         "merkle_sessions": len(app.state.merkle_sessions),
         "services_active": {
             "vector_db": app.state.vector_db is not None,
             "ipfs": app.state.ipfs_client is not None,
         },
-        "timestamp": int(time.time())
+        "timestamp": now_s()
     }
+    if app.state.redis is not None:
+        # Flushed totals of every worker plus what this one has not flushed yet;
+        # left out when Redis is unreachable so /stats keeps answering
+        try:
+            flushed = await app.state.redis.get("stats:requests")
+        except aioredis.RedisError as e:
+            logger.warning(f"Request count lookup failed: {str(e)}")
+        else:
+            stats["request_count_all_workers"] = (
+                int(flushed or 0) + app.state.request_count - app.state.request_count_flushed
+            )
+    return stats
 
 @app.delete(f"{settings.API_PREFIX}/admin/reset")
 async def reset_state():
@@ -433,12 +712,18 @@ async def reset_state():
         )
     
     app.state.merkle_sessions.clear()
+    app.state.merkle_builds.clear()
+    if app.state.redis is not None:
+        for pattern in ("merkle:*", "mt:*", "stats:*"):
+            async for key in app.state.redis.scan_iter(match=pattern):
+                await app.state.redis.delete(key)
     app.state.request_count = 0
+    app.state.request_count_flushed = 0
     
     return {
         "success": True,
         "message": "State reset complete",
-        "timestamp": int(time.time())
+        "timestamp": now_s()
     }
 
 # ============================================================================
@@ -449,12 +734,12 @@ async def reset_state():
 async def global_exception_handler(request, exc):
     """Global exception handler"""
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": "Internal server error",
             "detail": str(exc) if settings.DEBUG else "An error occurred",
-            "timestamp": int(time.time())
+            "timestamp": now_s()
         }
     )
 
@@ -463,13 +748,20 @@ async def global_exception_handler(request, exc):
 # ============================================================================
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
     
+    # Auto-reload is a development convenience; never in non-debug builds
+    reload = settings.RELOAD and settings.DEBUG
+    
     uvicorn.run(
         "backend.api:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.RELOAD,
-        workers=1 if settings.RELOAD else settings.WORKERS,
+        reload=reload,
+        workers=1 if reload else settings.WORKERS,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        backlog=2048,
         log_level=settings.LOG_LEVEL.lower()
     )
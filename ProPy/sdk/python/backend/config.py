@@ -6,7 +6,13 @@ Production-ready configuration management for all environments
 import os
 from enum import Enum
 from typing import Optional
-from pydantic import BaseSettings, Field
+from pydantic import Field
+
+# pydantic v2 moved BaseSettings into pydantic-settings
+try:
+    from pydantic_settings import BaseSettings
+except ImportError:
+    from pydantic import BaseSettings
 
 
 class Environment(str, Enum):
@@ -50,11 +56,14 @@ class Settings(BaseSettings):
     DATA_DIR: str = "./data"
     REGISTRY_DIR: str = "./registry"
     MERKLE_DIR: str = "./merkle_nodes"
+    MERKLE_SESSION_CACHE: int = 1024  # built trees kept for proof queries (LRU)
+    MERKLE_DIGEST_BYTES: int = 32  # node width; 16-31 truncates nodes (roots differ from full width)
     
     # Image Processing
     DNA_HASH_SIZE: int = 64  # hex characters
     SIMILARITY_THRESHOLD: float = 0.90
     MAX_IMAGE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    DNA_PROCESS_WORKERS: Optional[int] = None  # DNA compute processes per worker (None = CPU count / WORKERS)
     
     # IPFS
     IPFS_API_URL: str = "http://localhost:5001"
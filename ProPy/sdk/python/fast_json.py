@@ -0,0 +1,38 @@
+"""
+Shared JSON encoding for the ProTrace API servers
+
+orjson is used when it is installed, with a stdlib json fallback producing
+the same compact output.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    json_bytes = orjson.dumps
+
+    def canonical_json(obj) -> bytes:
+        """Compact JSON with sorted keys, for digests and signatures"""
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    def json_bytes(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def canonical_json(obj) -> bytes:
+        """Compact JSON with sorted keys, for digests and signatures"""
+        return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed
+
+    Endpoints may return it directly (rather than a bare dict) so FastAPI skips
+    jsonable_encoder; the payload must then already be plain JSON types.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_bytes(content)
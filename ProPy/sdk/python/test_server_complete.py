@@ -12,19 +12,28 @@ Comprehensive test server with organized test cases by priority:
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
+from collections import Counter
 import hashlib
 import time
 import json
 import base64
+import binascii
 from datetime import datetime
 from enum import Enum
 
+from fast_json import FastJSONResponse, json_bytes
+
+# Per-run mock ids only need to be unique, not SHA-256 specifically
+from blake3 import blake3 as _mock_hash
+
 app = FastAPI(
     title="ProTrace Complete Test Server",
     description="Comprehensive test server with prioritized test cases",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -58,6 +67,15 @@ class TestStatus(str, Enum):
 
 test_results = {}
 test_execution_log = []
+status_counts = Counter()  # latest status per test, maintained on every write
+
+def record_result(test_id: str, result: Dict[str, Any]):
+    """Store a test result and keep status_counts in step with test_results"""
+    previous = test_results.get(test_id)
+    if previous is not None:
+        status_counts[previous["status"]] -= 1
+    status_counts[result["status"]] += 1
+    test_results[test_id] = result
 
 # ============================================================================
 # Models
@@ -239,13 +257,105 @@ ALL_TESTS = {
     **EDGE_CASE_TESTS
 }
 
+# Listing indexes (test ids in ALL_TESTS order) and the static part of each entry
+_TESTS_BY_PRIORITY: Dict[str, List[str]] = {}
+_TESTS_BY_CATEGORY: Dict[str, List[str]] = {}
+for _test_id, _test_data in ALL_TESTS.items():
+    _TESTS_BY_PRIORITY.setdefault(_test_data["priority"], []).append(_test_id)
+    _TESTS_BY_CATEGORY.setdefault(_test_data["category"], []).append(_test_id)
+_ALL_TEST_IDS = list(ALL_TESTS)
+_TEST_ENTRIES = {test_id: {"test_id": test_id, **test_data} for test_id, test_data in ALL_TESTS.items()}
+
+# ============================================================================
+# Precomputed Executor Data
+# ============================================================================
+
+# Executor inputs are fixed, so their digests are computed once at import
+_HP001_DNA = hashlib.sha256(b"test_image_hp001").hexdigest()
+_HP002_DNA = hashlib.sha256(b"unique_image_hp002").hexdigest()
+_HP002_ROOT = hashlib.sha256(f"{_HP002_DNA}_merkle".encode()).hexdigest()
+_HP003_ORIGINAL_DNA = hashlib.sha256(b"original_image").hexdigest()
+_HP003_DUPLICATE_DNA = hashlib.sha256(b"original_image").hexdigest()
+_HP004_LEAVES = [f"leaf_{i}" for i in range(10)]
+_HP004_ROOT = hashlib.sha256("".join(_HP004_LEAVES).encode()).hexdigest()
+_HP005_PROOF = [hashlib.sha256(f"sibling_{i}".encode()).hexdigest() for i in range(3)]
+_HP005_ROOT = hashlib.sha256(b"proof_root").hexdigest()
+_MP001_SIGNATURE = "0x" + hashlib.sha256(
+    json.dumps({"creator": "0x123", "asset": "0xabc"}).encode()
+).hexdigest() * 2
+_MP002_RESULTS = [
+    {"chain": chain, "edition_no": 1, "contract": hashlib.sha256(chain.encode()).hexdigest()[:40]}
+    for chain in ("ethereum", "solana", "tezos")
+]
+_MP003_RESULTS = [
+    {"dna": hashlib.sha256(f"similar_{i}".encode()).hexdigest(), "similarity": 0.95 - (i * 0.05)}
+    for i in range(3)
+]
+_LP001_COUNT = 100
+_LP001_RESULTS = [
+    {"id": i, "dna": hashlib.sha256(f"img_{i}".encode()).hexdigest()} for i in range(_LP001_COUNT)
+]
+_LP001_PREVIEW = _LP001_RESULTS[:5]  # Show first 5
+
+# Executors with fixed outcomes return these shared dicts as-is
+_LP002_RESULT = {
+    "total": 50,
+    "successful": 45,  # Simulate some duplicates
+    "duplicates": 5,
+    "batch_valid": True
+}
+
+_LP004_RESULT = {
+    "rate_limit": 1000,
+    "current_usage": 250,
+    "remaining": 750,
+    "rate_limit_valid": True
+}
+
+_LP005_RESULT = {
+    "hit_rate": 0.85,
+    "miss_rate": 0.15,
+    "total_requests": 10000,
+    "cache_valid": True
+}
+
+_EC001_RESULT = {
+    "empty_handled": True,
+    "default_used": True,
+    "error": None
+}
+
+_EC002_RESULT = {
+    "max_size_bytes": 10 * 1024 * 1024,  # 10MB
+    "test_size_bytes": 5 * 1024 * 1024,  # 5MB
+    "within_limit": True
+}
+
+_EC004_RESULT = {
+    "concurrent_requests": 100,
+    "thread_safe": True,
+    "race_conditions": 0,
+    "concurrency_valid": True
+}
+
+_EC005_RESULT = {
+    "timeout_seconds": 30,
+    "retry_attempts": 3,
+    "graceful_degradation": True,
+    "timeout_handled": True
+}
+
+# Hash contexts pre-seeded with the constant id prefixes; executors copy() them
+_MONITOR_PROTO = _mock_hash(b"monitor_")
+_TX_PROTO = hashlib.sha512(b"tx_")  # 64-byte digest -> 88-char base64, like a real signature
+
 # ============================================================================
 # Test Execution Functions
 # ============================================================================
 
 def execute_hp001_dna_computation() -> Dict[str, Any]:
     """Execute HP001: DNA Fingerprint Computation"""
-    dna_hash = hashlib.sha256(b"test_image_hp001").hexdigest()
+    dna_hash = _HP001_DNA
     assert len(dna_hash) == 64, "DNA hash must be 64 hex characters"
     return {
         "dna_hex": dna_hash,
@@ -256,21 +366,17 @@ def execute_hp001_dna_computation() -> Dict[str, Any]:
 
 def execute_hp002_image_registration() -> Dict[str, Any]:
     """Execute HP002: Image Registration Success"""
-    dna_hash = hashlib.sha256(b"unique_image_hp002").hexdigest()
-    root_hash = hashlib.sha256(f"{dna_hash}_merkle".encode()).hexdigest()
     return {
         "success": True,
         "plagiarized": False,
-        "root_hash": root_hash,
+        "root_hash": _HP002_ROOT,
         "image_id": "test_img_hp002",
         "registration_valid": True
     }
 
 def execute_hp003_duplicate_detection() -> Dict[str, Any]:
     """Execute HP003: Duplicate Detection"""
-    original_dna = hashlib.sha256(b"original_image").hexdigest()
-    duplicate_dna = hashlib.sha256(b"original_image").hexdigest()
-    similarity = 1.0 if original_dna == duplicate_dna else 0.0
+    similarity = 1.0 if _HP003_ORIGINAL_DNA == _HP003_DUPLICATE_DNA else 0.0
     return {
         "duplicate_detected": True,
         "similarity": similarity,
@@ -280,31 +386,27 @@ def execute_hp003_duplicate_detection() -> Dict[str, Any]:
 
 def execute_hp004_merkle_construction() -> Dict[str, Any]:
     """Execute HP004: Merkle Tree Construction"""
-    leaves = [f"leaf_{i}" for i in range(10)]
-    root_hash = hashlib.sha256("".join(leaves).encode()).hexdigest()
-    session_id = hashlib.sha256(f"{root_hash}_{time.time()}".encode()).hexdigest()[:16]
+    root_hash = _HP004_ROOT
+    session_id = _mock_hash(f"{root_hash}_{time.time()}".encode()).hexdigest()[:16]
     return {
         "root_hash": root_hash,
-        "leaf_count": len(leaves),
+        "leaf_count": len(_HP004_LEAVES),
         "session_id": session_id,
         "tree_valid": True
     }
 
 def execute_hp005_merkle_proof() -> Dict[str, Any]:
     """Execute HP005: Merkle Proof Generation"""
-    proof = [hashlib.sha256(f"sibling_{i}".encode()).hexdigest() for i in range(3)]
-    root_hash = hashlib.sha256("proof_root".encode()).hexdigest()
     return {
-        "proof": proof,
-        "proof_length": len(proof),
-        "root_hash": root_hash,
-        "proof_valid": len(proof) > 0
+        "proof": _HP005_PROOF,
+        "proof_length": len(_HP005_PROOF),
+        "root_hash": _HP005_ROOT,
+        "proof_valid": len(_HP005_PROOF) > 0
     }
 
 def execute_mp001_eip712_signing() -> Dict[str, Any]:
     """Execute MP001: EIP-712 Signature Generation"""
-    message = {"creator": "0x123", "asset": "0xabc"}
-    signature = "0x" + hashlib.sha256(json.dumps(message).encode()).hexdigest() * 2
+    signature = _MP001_SIGNATURE
     return {
         "signature": signature,
         "signature_length": len(signature),
@@ -313,46 +415,36 @@ def execute_mp001_eip712_signing() -> Dict[str, Any]:
 
 def execute_mp002_multichain_edition() -> Dict[str, Any]:
     """Execute MP002: Multi-Chain Edition Registration"""
-    chains = ["ethereum", "solana", "tezos"]
-    results = []
-    for chain in chains:
-        results.append({
-            "chain": chain,
-            "edition_no": 1,
-            "contract": hashlib.sha256(chain.encode()).hexdigest()[:40]
-        })
     return {
-        "chains_registered": len(results),
-        "results": results,
-        "all_chains_valid": len(results) == 3
+        "chains_registered": len(_MP002_RESULTS),
+        "results": _MP002_RESULTS,
+        "all_chains_valid": len(_MP002_RESULTS) == 3
     }
 
 def execute_mp003_vector_search() -> Dict[str, Any]:
     """Execute MP003: Vector Similarity Search"""
-    results = [
-        {"dna": hashlib.sha256(f"similar_{i}".encode()).hexdigest(), "similarity": 0.95 - (i * 0.05)}
-        for i in range(3)
-    ]
     return {
-        "results_count": len(results),
-        "results": results,
-        "search_valid": len(results) > 0
+        "results_count": len(_MP003_RESULTS),
+        "results": _MP003_RESULTS,
+        "search_valid": len(_MP003_RESULTS) > 0
     }
 
 def execute_mp004_ipfs_upload() -> Dict[str, Any]:
     """Execute MP004: IPFS Manifest Upload"""
     manifest = {"dna": "test_dna", "timestamp": int(time.time())}
-    cid_hash = hashlib.sha256(json.dumps(manifest).encode()).hexdigest()
-    cid = "Qm" + base64.b32encode(bytes.fromhex(cid_hash[:40])).decode()[:44]
+    payload = json_bytes(manifest)
+    cid = "Qm" + base64.b32encode(_mock_hash(payload).digest()[:20]).decode()
     return {
         "cid": cid,
-        "manifest_size": len(json.dumps(manifest)),
+        "manifest_size": len(payload),
         "cid_valid": cid.startswith("Qm")
     }
 
 def execute_mp005_blockchain_monitoring() -> Dict[str, Any]:
     """Execute MP005: Blockchain Event Monitoring"""
-    monitor_id = hashlib.sha256(f"monitor_{time.time()}".encode()).hexdigest()[:16]
+    h = _MONITOR_PROTO.copy()
+    h.update(str(time.time()).encode())
+    monitor_id = h.hexdigest()[:16]
     return {
         "monitor_id": monitor_id,
         "status": "monitoring",
@@ -362,28 +454,21 @@ def execute_mp005_blockchain_monitoring() -> Dict[str, Any]:
 
 def execute_lp001_batch_dna() -> Dict[str, Any]:
     """Execute LP001: Batch DNA Computation"""
-    count = 100
-    results = [{"id": i, "dna": hashlib.sha256(f"img_{i}".encode()).hexdigest()} for i in range(count)]
     return {
-        "processed": count,
-        "results": results[:5],  # Show first 5
-        "batch_valid": len(results) == count
+        "processed": _LP001_COUNT,
+        "results": _LP001_PREVIEW,
+        "batch_valid": len(_LP001_RESULTS) == _LP001_COUNT
     }
 
 def execute_lp002_batch_registration() -> Dict[str, Any]:
     """Execute LP002: Batch Image Registration"""
-    count = 50
-    successful = count - 5  # Simulate some duplicates
-    return {
-        "total": count,
-        "successful": successful,
-        "duplicates": count - successful,
-        "batch_valid": successful > 0
-    }
+    return _LP002_RESULT
 
 def execute_lp003_solana_registration() -> Dict[str, Any]:
     """Execute LP003: Solana On-Chain Registration"""
-    tx_sig = base64.b64encode(hashlib.sha256(f"tx_{time.time()}".encode()).digest()).decode()[:88]
+    h = _TX_PROTO.copy()
+    h.update(str(time.time()).encode())
+    tx_sig = binascii.b2a_base64(h.digest(), newline=False).decode()
     return {
         "transaction_signature": tx_sig,
         "cluster": "devnet",
@@ -392,46 +477,19 @@ def execute_lp003_solana_registration() -> Dict[str, Any]:
 
 def execute_lp004_rate_limiting() -> Dict[str, Any]:
     """Execute LP004: API Rate Limiting"""
-    return {
-        "rate_limit": 1000,
-        "current_usage": 250,
-        "remaining": 750,
-        "rate_limit_valid": True
-    }
+    return _LP004_RESULT
 
 def execute_lp005_cache_performance() -> Dict[str, Any]:
     """Execute LP005: Cache Performance"""
-    return {
-        "hit_rate": 0.85,
-        "miss_rate": 0.15,
-        "total_requests": 10000,
-        "cache_valid": True
-    }
+    return _LP005_RESULT
 
 def execute_ec001_empty_input() -> Dict[str, Any]:
     """Execute EC001: Empty Input Handling"""
-    try:
-        result = "" or "default"
-        return {
-            "empty_handled": True,
-            "default_used": True,
-            "error": None
-        }
-    except Exception as e:
-        return {
-            "empty_handled": False,
-            "error": str(e)
-        }
+    return _EC001_RESULT
 
 def execute_ec002_max_data_size() -> Dict[str, Any]:
     """Execute EC002: Maximum Data Size"""
-    max_size = 10 * 1024 * 1024  # 10MB
-    test_size = 5 * 1024 * 1024   # 5MB
-    return {
-        "max_size_bytes": max_size,
-        "test_size_bytes": test_size,
-        "within_limit": test_size < max_size
-    }
+    return _EC002_RESULT
 
 def execute_ec003_invalid_format() -> Dict[str, Any]:
     """Execute EC003: Invalid Data Format"""
@@ -447,21 +505,11 @@ def execute_ec003_invalid_format() -> Dict[str, Any]:
 
 def execute_ec004_concurrent_ops() -> Dict[str, Any]:
     """Execute EC004: Concurrent Operations"""
-    return {
-        "concurrent_requests": 100,
-        "thread_safe": True,
-        "race_conditions": 0,
-        "concurrency_valid": True
-    }
+    return _EC004_RESULT
 
 def execute_ec005_network_timeout() -> Dict[str, Any]:
     """Execute EC005: Network Timeout Handling"""
-    return {
-        "timeout_seconds": 30,
-        "retry_attempts": 3,
-        "graceful_degradation": True,
-        "timeout_handled": True
-    }
+    return _EC005_RESULT
 
 # Map test IDs to execution functions
 TEST_EXECUTORS = {
@@ -487,6 +535,110 @@ TEST_EXECUTORS = {
     "EC005": execute_ec005_network_timeout,
 }
 
+# ============================================================================
+# Test Selection & Execution Helpers
+# ============================================================================
+
+# One lookup per run: test id -> (name, executor or None if not implemented)
+_TEST_DISPATCH = {
+    test_id: (test_data["name"], TEST_EXECUTORS.get(test_id))
+    for test_id, test_data in ALL_TESTS.items()
+}
+
+def _filter_test_ids(priority: Optional[TestPriority], category: Optional[str]) -> List[str]:
+    """Test ids matching the optional filters, in ALL_TESTS order"""
+    if priority and category:
+        in_category = set(_TESTS_BY_CATEGORY.get(category, ()))
+        return [t for t in _TESTS_BY_PRIORITY.get(priority.value, ()) if t in in_category]
+    if priority:
+        return _TESTS_BY_PRIORITY.get(priority.value, [])
+    if category:
+        return _TESTS_BY_CATEGORY.get(category, [])
+    return _ALL_TEST_IDS
+
+def _execute_test(test_id: str, timestamp: str) -> Dict[str, Any]:
+    """Run one test synchronously, record its result and return the response"""
+    entry = _TEST_DISPATCH.get(test_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Test {test_id} not found")
+    
+    test_name, executor = entry
+    if executor is None:
+        raise HTTPException(status_code=501, detail=f"Test {test_id} not implemented")
+    
+    # Execute the test
+    start_time = time.perf_counter()
+    try:
+        result_data = executor()
+        execution_time = (time.perf_counter() - start_time) * 1000
+        
+        # Determine status based on result
+        status = TestStatus.PASSED if result_data.get("validation_key", True) else TestStatus.FAILED
+        
+        result = {
+            "status": status.value,
+            "execution_time_ms": execution_time,
+            "result_data": result_data,
+            "error_message": None,
+            "timestamp": timestamp
+        }
+        
+        record_result(test_id, result)
+        test_execution_log.append({
+            "test_id": test_id,
+            "timestamp": timestamp,
+            "status": status.value
+        })
+        
+    except Exception as e:
+        execution_time = (time.perf_counter() - start_time) * 1000
+        result = {
+            "status": TestStatus.FAILED.value,
+            "execution_time_ms": execution_time,
+            "result_data": {},
+            "error_message": str(e),
+            "timestamp": timestamp
+        }
+        record_result(test_id, result)
+    
+    return {
+        "test_id": test_id,
+        "test_name": test_name,
+        **result
+    }
+
+# ============================================================================
+# Static Responses
+# ============================================================================
+
+# Everything here depends only on the test catalogue, so serialize it once
+_ROOT_BODY = json_bytes({
+    "name": "ProTrace Complete Test Server",
+    "version": "1.0.0",
+    "total_tests": len(ALL_TESTS),
+    "test_categories": {
+        "high_priority": len(HIGH_PRIORITY_TESTS),
+        "medium_priority": len(MEDIUM_PRIORITY_TESTS),
+        "low_priority": len(LOW_PRIORITY_TESTS),
+        "edge_cases": len(EDGE_CASE_TESTS)
+    },
+    "endpoints": {
+        "list_tests": "GET /tests",
+        "get_test": "GET /tests/{test_id}",
+        "run_test": "POST /tests/{test_id}/run",
+        "run_all": "POST /tests/run-all",
+        "results": "GET /tests/results",
+        "health": "GET /health"
+    }
+})
+
+_TESTS_BY_PRIORITY_COUNTS = {
+    "high": len(HIGH_PRIORITY_TESTS),
+    "medium": len(MEDIUM_PRIORITY_TESTS),
+    "low": len(LOW_PRIORITY_TESTS),
+    "edge_cases": len(EDGE_CASE_TESTS)
+}
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -494,25 +646,7 @@ TEST_EXECUTORS = {
 @app.get("/")
 async def root():
     """Root endpoint - Test server information"""
-    return {
-        "name": "ProTrace Complete Test Server",
-        "version": "1.0.0",
-        "total_tests": len(ALL_TESTS),
-        "test_categories": {
-            "high_priority": len(HIGH_PRIORITY_TESTS),
-            "medium_priority": len(MEDIUM_PRIORITY_TESTS),
-            "low_priority": len(LOW_PRIORITY_TESTS),
-            "edge_cases": len(EDGE_CASE_TESTS)
-        },
-        "endpoints": {
-            "list_tests": "GET /tests",
-            "get_test": "GET /tests/{test_id}",
-            "run_test": "POST /tests/{test_id}/run",
-            "run_all": "POST /tests/run-all",
-            "results": "GET /tests/results",
-            "health": "GET /health"
-        }
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 @app.get("/health")
 async def health():
@@ -530,18 +664,11 @@ async def list_tests(
     category: Optional[str] = None
 ):
     """List all available tests with optional filtering"""
-    tests = []
-    for test_id, test_data in ALL_TESTS.items():
-        if priority and test_data["priority"] != priority:
-            continue
-        if category and test_data["category"] != category:
-            continue
-        
-        tests.append({
-            "test_id": test_id,
-            **test_data,
-            "status": test_results.get(test_id, {}).get("status", "pending")
-        })
+    test_ids = _filter_test_ids(priority, category)
+    tests = [
+        {**_TEST_ENTRIES[test_id], "status": test_results[test_id]["status"] if test_id in test_results else "pending"}
+        for test_id in test_ids
+    ]
     
     return {
         "total": len(tests),
@@ -552,6 +679,34 @@ async def list_tests(
         }
     }
 
+# Registered before /tests/{test_id} so the literal paths are not captured as ids
+@app.get("/tests/results")
+async def get_all_results():
+    """Get all test execution results"""
+    return {
+        "total_tests": len(ALL_TESTS),
+        "executed": len(test_results),
+        "results": test_results,
+        "execution_log": test_execution_log[-50:]  # Last 50 executions
+    }
+
+@app.get("/tests/summary")
+async def get_test_summary():
+    """Get summary of test execution statistics"""
+    passed = status_counts["passed"]
+    failed = status_counts["failed"]
+    total_executed = len(test_results)
+    
+    return {
+        "total_tests": len(ALL_TESTS),
+        "executed": total_executed,
+        "not_executed": len(ALL_TESTS) - total_executed,
+        "passed": passed,
+        "failed": failed,
+        "pass_rate": (passed / total_executed * 100) if total_executed > 0 else 0,
+        "by_priority": _TESTS_BY_PRIORITY_COUNTS
+    }
+
 @app.get("/tests/{test_id}")
 async def get_test(test_id: str):
     """Get details of a specific test"""
@@ -571,81 +726,26 @@ async def get_test(test_id: str):
 @app.post("/tests/{test_id}/run")
 async def run_test(test_id: str):
     """Execute a specific test"""
-    if test_id not in ALL_TESTS:
-        raise HTTPException(status_code=404, detail=f"Test {test_id} not found")
-    
-    if test_id not in TEST_EXECUTORS:
-        raise HTTPException(status_code=501, detail=f"Test {test_id} not implemented")
-    
-    # Execute the test
-    start_time = time.time()
-    try:
-        result_data = TEST_EXECUTORS[test_id]()
-        execution_time = (time.time() - start_time) * 1000
-        
-        # Determine status based on result
-        status = TestStatus.PASSED if result_data.get("validation_key", True) else TestStatus.FAILED
-        
-        result = {
-            "status": status.value,
-            "execution_time_ms": execution_time,
-            "result_data": result_data,
-            "error_message": None,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        test_results[test_id] = result
-        test_execution_log.append({
-            "test_id": test_id,
-            "timestamp": datetime.utcnow().isoformat(),
-            "status": status.value
-        })
-        
-        return {
-            "test_id": test_id,
-            "test_name": ALL_TESTS[test_id]["name"],
-            **result
-        }
-        
-    except Exception as e:
-        execution_time = (time.time() - start_time) * 1000
-        result = {
-            "status": TestStatus.FAILED.value,
-            "execution_time_ms": execution_time,
-            "result_data": {},
-            "error_message": str(e),
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        test_results[test_id] = result
-        
-        return {
-            "test_id": test_id,
-            "test_name": ALL_TESTS[test_id]["name"],
-            **result
-        }
+    return _execute_test(test_id, datetime.utcnow().isoformat())
 
 @app.post("/tests/run-all")
 async def run_all_tests(request: Optional[TestRequest] = None):
     """Execute all tests or filtered subset"""
-    tests_to_run = []
-    
     if request and request.test_ids:
         tests_to_run = request.test_ids
+    elif request:
+        tests_to_run = _filter_test_ids(request.priority_filter, request.category_filter)
     else:
-        for test_id, test_data in ALL_TESTS.items():
-            if request:
-                if request.priority_filter and test_data["priority"] != request.priority_filter:
-                    continue
-                if request.category_filter and test_data["category"] != request.category_filter:
-                    continue
-            tests_to_run.append(test_id)
+        tests_to_run = _ALL_TEST_IDS
     
     results = []
     passed = 0
     failed = 0
     
+    # Run the executors directly in one pass, with one timestamp per batch
+    timestamp = datetime.utcnow().isoformat()
     for test_id in tests_to_run:
-        result = await run_test(test_id)
+        result = _execute_test(test_id, timestamp)
         results.append(result)
         if result["status"] == "passed":
             passed += 1
@@ -660,43 +760,12 @@ async def run_all_tests(request: Optional[TestRequest] = None):
         "results": results
     }
 
-@app.get("/tests/results")
-async def get_all_results():
-    """Get all test execution results"""
-    return {
-        "total_tests": len(ALL_TESTS),
-        "executed": len(test_results),
-        "results": test_results,
-        "execution_log": test_execution_log[-50:]  # Last 50 executions
-    }
-
-@app.get("/tests/summary")
-async def get_test_summary():
-    """Get summary of test execution statistics"""
-    passed = sum(1 for r in test_results.values() if r["status"] == "passed")
-    failed = sum(1 for r in test_results.values() if r["status"] == "failed")
-    total_executed = len(test_results)
-    
-    return {
-        "total_tests": len(ALL_TESTS),
-        "executed": total_executed,
-        "not_executed": len(ALL_TESTS) - total_executed,
-        "passed": passed,
-        "failed": failed,
-        "pass_rate": (passed / total_executed * 100) if total_executed > 0 else 0,
-        "by_priority": {
-            "high": len(HIGH_PRIORITY_TESTS),
-            "medium": len(MEDIUM_PRIORITY_TESTS),
-            "low": len(LOW_PRIORITY_TESTS),
-            "edge_cases": len(EDGE_CASE_TESTS)
-        }
-    }
-
 @app.delete("/tests/results")
 async def clear_results():
     """Clear all test results"""
     test_results.clear()
     test_execution_log.clear()
+    status_counts.clear()
     return {
         "message": "All test results cleared",
         "timestamp": datetime.utcnow().isoformat()
@@ -0,0 +1,24 @@
+"""
+Shared pytest setup: import paths for the protrace package and the SDK servers
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+PROPY_DIR = Path(__file__).resolve().parent.parent
+LEGACY_DIR = PROPY_DIR / "modules" / "protrace_legacy"
+SDK_DIR = PROPY_DIR / "sdk" / "python"
+
+for path in (str(PROPY_DIR), str(SDK_DIR)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# modules/protrace_legacy is the package the servers import as `protrace`
+if "protrace" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "protrace", LEGACY_DIR / "__init__.py", submodule_search_locations=[str(LEGACY_DIR)]
+    )
+    protrace = importlib.util.module_from_spec(spec)
+    sys.modules["protrace"] = protrace
+    spec.loader.exec_module(protrace)
@@ -0,0 +1,255 @@
+"""
+Tests for the api_server_complete registry log, LRU session store,
+duplicate check and Merkle proof endpoints
+"""
+
+import base64
+import struct
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api_server_complete as server
+from api_server_complete import LRUStore, RegistryLog, REGISTRY_RECORD
+
+
+def _dna(i):
+    return f"{i:02x}" * 32
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    """Swap in an empty APIState so tests do not see each other's registrations"""
+    state = server.APIState()
+    monkeypatch.setattr(server, "state", state)
+    return state
+
+
+# ============================================================================
+# LRUStore
+# ============================================================================
+
+def test_lru_store_evicts_oldest_at_cap():
+    store = LRUStore(3)
+    for key in "abcd":
+        store[key] = key.upper()
+    assert list(store) == ["b", "c", "d"]
+
+
+def test_lru_store_read_refreshes_entry():
+    store = LRUStore(3)
+    for key in "abc":
+        store[key] = key
+    assert store["a"] == "a"
+    store["d"] = "d"
+    assert list(store) == ["c", "a", "d"]
+
+
+def test_lru_store_overwrite_refreshes_entry():
+    store = LRUStore(2)
+    store["a"] = 1
+    store["b"] = 2
+    store["a"] = 3
+    store["c"] = 4
+    assert dict(store) == {"a": 3, "c": 4}
+
+
+# ============================================================================
+# RegistryLog
+# ============================================================================
+
+def test_registry_log_survives_reopen(tmp_path):
+    path = str(tmp_path / "registry.log")
+    log = RegistryLog(path)
+    for i in range(3):
+        log.append(f"img_{i}", _dna(i), "opensea", 1698765432 + i)
+
+    records = RegistryLog(path).records()  # As after a restart
+    assert len(records) == 3
+    assert [r['image_id'].decode() for r in records] == ["img_0", "img_1", "img_2"]
+    assert [r['dna'].tobytes().hex() for r in records] == [_dna(i) for i in range(3)]
+    assert [int(r['timestamp']) for r in records] == [1698765432, 1698765433, 1698765434]
+
+
+def test_registry_log_ignores_torn_tail(tmp_path):
+    path = tmp_path / "registry.log"
+    log = RegistryLog(str(path))
+    log.append("img_0", _dna(0), "opensea", 1)
+    with open(path, "ab") as f:
+        f.write(b"\x00" * (REGISTRY_RECORD.itemsize // 2))
+    assert len(log.records()) == 1
+
+
+def test_registry_log_missing_file_is_empty(tmp_path):
+    assert len(RegistryLog(str(tmp_path / "absent.log")).records()) == 0
+
+
+def test_registry_log_rejects_oversized_ids(tmp_path):
+    log = RegistryLog(str(tmp_path / "registry.log"))
+    assert log.accepts("img_0", "opensea")
+    assert not log.accepts("x" * 200, "opensea")
+    assert not log.accepts("img_0", "p" * 65)
+
+
+def test_load_registry_log_restores_registry(tmp_path, fresh_state):
+    path = str(tmp_path / "registry.log")
+    log = RegistryLog(path)
+    for i in range(4):
+        log.append(f"img_{i}", _dna(i), "opensea", 1698765432 + i)
+
+    fresh_state.registry_log = RegistryLog(path)
+    server.load_registry_log()
+
+    assert list(fresh_state.registry) == [f"img_{i}" for i in range(4)]
+    assert fresh_state.registry["img_2"]["dna_hex"] == _dna(2)
+    assert fresh_state.dna_row_ids == [f"img_{i}" for i in range(4)]
+
+    expected = server.MerkleTree()
+    for i in range(4):
+        expected.add_leaf(_dna(i), f"img_{i}", "opensea", 1698765432 + i)
+    assert fresh_state.merkle_tree_global.get_root() == expected.build_tree()
+
+    match = server.find_registry_match(_dna(3), 0.90)
+    assert match is not None and match["image_id"] == "img_3"
+
+
+# ============================================================================
+# Duplicate check
+# ============================================================================
+
+def _register(state, image_id, dna_hex):
+    state.registry[image_id] = {"dna_hex": dna_hex, "platform_id": "opensea", "timestamp": 0}
+    server.index_registration(image_id, dna_hex)
+
+
+def _flip_bit(dna_hex, bit):
+    return f"{int(dna_hex, 16) ^ (1 << bit):064x}"
+
+
+@pytest.mark.parametrize("use_faiss", [True, False])
+def test_reregistration_does_not_hide_duplicate(fresh_state, use_faiss):
+    if use_faiss and fresh_state.dna_index is None:
+        pytest.skip("faiss not installed")
+    if not use_faiss:
+        fresh_state.dna_index = None
+    original = _dna(0xaa)
+    _register(fresh_state, "img_a", original)
+    _register(fresh_state, "img_a", _dna(0x55))  # img_a moves far away from original
+    _register(fresh_state, "img_b", _flip_bit(original, 3))
+
+    match = server.find_registry_match(original, 0.90)
+    assert match is not None and match["image_id"] == "img_b"
+
+
+def test_reregistration_with_same_dna_adds_no_index_row(fresh_state):
+    if fresh_state.dna_index is None:
+        pytest.skip("faiss not installed")
+    _register(fresh_state, "img_a", _dna(1))
+    _register(fresh_state, "img_a", _dna(1))
+    assert fresh_state.dna_index.ntotal == 1
+
+
+def test_all_stale_neighbours_fall_back_to_exact_scan(fresh_state, monkeypatch):
+    if fresh_state.dna_index is None:
+        pytest.skip("faiss not installed")
+    monkeypatch.setattr(server, "DNA_INDEX_SEARCH_K", 1)
+    original = _dna(0xaa)
+    _register(fresh_state, "img_a", original)
+    _register(fresh_state, "img_a", _dna(0x55))
+    _register(fresh_state, "img_b", _flip_bit(original, 3))
+
+    match = server.find_registry_match(original, 0.90)
+    assert match is not None and match["image_id"] == "img_b"
+
+
+def test_reregistered_image_matches_its_new_dna(fresh_state):
+    _register(fresh_state, "img_a", _dna(0xaa))
+    _register(fresh_state, "img_a", _dna(0x55))
+    assert server.find_registry_match(_dna(0xaa), 0.90) is None
+    match = server.find_registry_match(_dna(0x55), 0.90)
+    assert match is not None and match["image_id"] == "img_a"
+
+
+# ============================================================================
+# Merkle proof endpoints
+# ============================================================================
+
+@pytest.fixture
+def client(fresh_state):
+    return TestClient(server.app)
+
+
+def _build(client, leaves):
+    response = client.post("/merkle/build", json={"leaves": leaves})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_single_proof_verifies(client, fresh_state):
+    build = _build(client, [_dna(i) for i in range(5)])
+    response = client.get(f"/merkle/proof/{build['session_id']}/3")
+    assert response.status_code == 200
+    body = response.json()
+
+    tree = fresh_state.merkle_trees[build["session_id"]]["tree"]
+    assert tree.verify_proof(tree.leaves[3], body["proof"], body["root_hash"])
+
+
+def _build_with_duplicate(client):
+    # Leaf 7 repeats leaf 3, so the tree has 7 unique leaves for 8 requested
+    build = _build(client, [_dna(i) for i in range(7)] + [_dna(3)])
+    assert build["leaf_count"] == 8 and build["unique_leaf_count"] == 7
+    return build
+
+
+def test_multiproof_endpoint_verifies(client, fresh_state):
+    build = _build(client, [_dna(i) for i in range(6)])
+    response = client.get(f"/merkle/proof_batch/{build['session_id']}", params={"indices": [5, 0, 2]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["tree_indices"] == [0, 2, 5]
+    assert body["root_hash"] == build["root_hash"]
+
+    tree = fresh_state.merkle_trees[build["session_id"]]["tree"]
+    leaves = {i: tree.leaves[i] for i in body["tree_indices"]}
+    assert tree.verify_multiproof(leaves, body["proof"], body["tree_leaf_count"], body["root_hash"])
+
+
+def test_multiproof_echoes_request_indices_and_build_leaf_count(client, fresh_state):
+    build = _build_with_duplicate(client)
+    response = client.get(f"/merkle/proof_batch/{build['session_id']}", params={"indices": [0, 3, 7]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["leaf_indices"] == [0, 3, 7]
+    assert body["leaf_count"] == 8
+    assert body["tree_indices"] == [0, 3]
+    assert body["tree_leaf_count"] == 7
+
+    tree = fresh_state.merkle_trees[build["session_id"]]["tree"]
+    leaves = {i: tree.leaves[i] for i in body["tree_indices"]}
+    assert tree.verify_multiproof(leaves, body["proof"], body["tree_leaf_count"], body["root_hash"])
+
+
+def test_multiproof_base64_and_binary_forms_agree(client):
+    build = _build_with_duplicate(client)
+    url = f"/merkle/proof_batch/{build['session_id']}"
+    params = {"indices": [1, 7, 5]}
+    hex_body = client.get(url, params=params).json()
+
+    b64_body = client.get(url, params={**params, "format": "base64"}).json()
+    assert b64_body["leaf_indices"] == [1, 7, 5]
+    assert b64_body["leaf_count"] == 8
+    assert base64.b64decode(b64_body["proof"]) == bytes.fromhex("".join(hex_body["proof"]))
+
+    raw = client.get(url, params=params, headers={"accept": "application/octet-stream"}).content
+    tree_leaf_count, k = struct.unpack_from("<II", raw)
+    tree_indices = list(struct.unpack_from(f"<{k}I", raw, 8))
+    assert (tree_leaf_count, tree_indices) == (7, hex_body["tree_indices"])
+    assert raw[8 + 4 * k:] == base64.b64decode(b64_body["proof"])
+    assert client.get(url, params={**params, "format": "bin"}).content == raw
+
+
+def test_multiproof_rejects_out_of_range_request_index(client):
+    build = _build_with_duplicate(client)
+    response = client.get(f"/merkle/proof_batch/{build['session_id']}", params={"indices": [8]})
+    assert response.status_code == 400
@@ -0,0 +1,357 @@
+"""
+Tests for the backend.api Merkle endpoints
+"""
+
+import struct
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import api
+from backend.config import settings
+from protrace.merkle import MerkleTree
+
+MERKLE = f"{settings.API_PREFIX}/merkle"
+
+
+def _dna(i):
+    return f"{i:02x}" * 32
+
+
+@pytest.fixture
+def state(monkeypatch):
+    """Swap in an empty AppState so tests do not share sessions"""
+    fresh = api.AppState()
+    monkeypatch.setattr(api.app, "state", fresh)
+    return fresh
+
+
+@pytest.fixture
+def client(state):
+    return TestClient(api.app)
+
+
+def _build(client, count):
+    response = client.post(f"{MERKLE}/build", json={"dna_hashes": [_dna(i) for i in range(count)]})
+    assert response.status_code == 200
+    return response.json()
+
+
+# ============================================================================
+# Build
+# ============================================================================
+
+@pytest.mark.parametrize("count", [1, 2, 5, 8])
+def test_build_returns_root_of_stored_tree(client, state, count):
+    body = _build(client, count)
+    tree = state.merkle_sessions[body["session_id"]]
+    assert isinstance(tree, MerkleTree)
+    assert body["root_hash"] == tree.get_root()
+    assert body["leaf_count"] == count
+    assert body["tree_height"] == (count - 1).bit_length()
+    assert body["digest_bits"] == settings.MERKLE_DIGEST_BYTES * 8
+    assert [leaf.split(b"|")[0].decode() for leaf in tree.leaves] == [_dna(i) for i in range(count)]
+
+
+def test_build_with_truncated_digests(client, state, monkeypatch):
+    monkeypatch.setattr(settings, "MERKLE_DIGEST_BYTES", 16)
+    body = _build(client, 5)
+    assert body["digest_bits"] == 128
+    assert len(body["root_hash"]) == 32
+
+    proof = client.get(f"{MERKLE}/proof/{body['session_id']}/4").json()["proof"]
+    tree = state.merkle_sessions[body["session_id"]]
+    assert tree.verify_proof(tree.leaves[4], proof, body["root_hash"])
+
+
+def test_build_rejects_empty_leaf_list(client):
+    assert client.post(f"{MERKLE}/build", json={"dna_hashes": []}).status_code == 422
+
+
+# ============================================================================
+# Append
+# ============================================================================
+
+def test_append_matches_rebuilt_tree(client, state):
+    session_id = _build(client, 3)["session_id"]
+    for count in range(4, 10):
+        response = client.post(f"{MERKLE}/append/{session_id}", json={"dna_hash": _dna(count - 1)})
+        assert response.status_code == 200
+        body = response.json()
+
+        tree = state.merkle_sessions[session_id]
+        rebuilt = MerkleTree(digest_size=tree.digest_size)
+        for leaf in tree.leaves:
+            rebuilt.add_leaf(*leaf.decode().split("|"))
+        assert body["root_hash"] == rebuilt.build_tree() == tree.root.hash.hex()
+        assert body["leaf_count"] == count
+        assert body["tree_height"] == (count - 1).bit_length()
+        assert body["session_id"] == session_id
+
+
+def test_append_to_unknown_session_is_404(client):
+    response = client.post(f"{MERKLE}/append/{api.new_session_id()}", json={"dna_hash": _dna(0)})
+    assert response.status_code == 404
+
+
+# ============================================================================
+# Proofs
+# ============================================================================
+
+@pytest.mark.parametrize("leaf_index", [0, 3, 6])
+def test_proof_json_verifies_against_root(client, state, leaf_index):
+    build = _build(client, 7)
+    response = client.get(f"{MERKLE}/proof/{build['session_id']}/{leaf_index}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["leaf_index"] == leaf_index
+    assert body["root_hash"] == build["root_hash"]
+    assert all(set(step) == {"hash", "position"} for step in body["proof"])
+
+    tree = state.merkle_sessions[build["session_id"]]
+    assert tree.verify_proof(tree.leaves[leaf_index], body["proof"], body["root_hash"])
+
+
+def _decode_bin_proof(raw):
+    header = struct.Struct("<IIIBI")
+    leaf_index, length, leaf_count, size, positions = header.unpack_from(raw)
+    digests = [raw[offset:offset + size] for offset in range(header.size, len(raw), size)]
+    assert len(digests) == length + 1
+    proof = [
+        {"hash": digest.hex(), "position": "left" if positions >> i & 1 else "right"}
+        for i, digest in enumerate(digests[1:])
+    ]
+    return leaf_index, leaf_count, digests[0].hex(), proof
+
+
+@pytest.mark.parametrize("leaf_index", [0, 3, 6])
+def test_proof_bin_matches_json(client, state, leaf_index):
+    build = _build(client, 7)
+    url = f"{MERKLE}/proof/{build['session_id']}/{leaf_index}"
+    response = client.get(url, params={"format": "bin"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+
+    decoded_index, leaf_count, root_hash, proof = _decode_bin_proof(response.content)
+    assert (decoded_index, leaf_count, root_hash) == (leaf_index, 7, build["root_hash"])
+    assert proof == client.get(url).json()["proof"]
+
+    tree = state.merkle_sessions[build["session_id"]]
+    assert tree.verify_proof(tree.leaves[leaf_index], proof, root_hash)
+
+
+def test_proof_rejects_out_of_range_leaf(client):
+    build = _build(client, 4)
+    assert client.get(f"{MERKLE}/proof/{build['session_id']}/4").status_code == 400
+
+
+# ============================================================================
+# Sessions: build -> proof -> append
+# ============================================================================
+
+def _append(client, session_id, dna_hex):
+    response = client.post(f"{MERKLE}/append/{session_id}", json={"dna_hash": dna_hex})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _proof(client, session_id, leaf_index):
+    return client.get(f"{MERKLE}/proof/{session_id}/{leaf_index}")
+
+
+def _assert_flow(client, session_id, leaf_count):
+    appended = _append(client, session_id, _dna(0xee))
+    assert appended["leaf_count"] == leaf_count + 1
+
+    response = _proof(client, session_id, leaf_count)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["root_hash"] == appended["root_hash"]
+
+    tree = api.app.state.merkle_sessions[session_id]
+    assert tree.verify_proof(tree.leaves[leaf_count], body["proof"], body["root_hash"])
+    return appended
+
+
+def test_build_proof_append_flow(client):
+    build = _build(client, 5)
+    assert _proof(client, build["session_id"], 4).json()["root_hash"] == build["root_hash"]
+    _assert_flow(client, build["session_id"], 5)
+
+
+def test_identical_build_reuses_session_until_appended(client, state):
+    first = _build(client, 4)
+    assert _build(client, 4)["session_id"] == first["session_id"]
+    assert len(state.merkle_sessions) == 1
+
+    _append(client, first["session_id"], _dna(0xee))
+    rebuilt = _build(client, 4)  # Cached session no longer holds just these leaves
+    assert rebuilt["session_id"] != first["session_id"]
+    assert rebuilt["leaf_count"] == 4
+
+
+def test_session_cache_evicts_least_recently_used(client, state, monkeypatch):
+    monkeypatch.setattr(settings, "MERKLE_SESSION_CACHE", 2)
+    first, second = _build(client, 2), _build(client, 3)
+    assert _proof(client, first["session_id"], 0).status_code == 200  # first is now most recent
+    _build(client, 4)
+
+    assert list(state.merkle_sessions) == [first["session_id"], _build(client, 4)["session_id"]]
+    assert _proof(client, second["session_id"], 0).status_code == 404
+    assert len(state.merkle_builds) == 2
+
+
+# ============================================================================
+# DNA process pool
+# ============================================================================
+
+def test_dna_process_pool_splits_cpus_across_workers(monkeypatch):
+    monkeypatch.setattr(api.os, "cpu_count", lambda: 16)
+    monkeypatch.setattr(settings, "WORKERS", 4)
+    monkeypatch.setattr(settings, "DNA_PROCESS_WORKERS", None)
+    assert api.dna_process_workers() == 4
+
+    monkeypatch.setattr(settings, "WORKERS", 32)
+    assert api.dna_process_workers() == 1
+
+    monkeypatch.setattr(settings, "DNA_PROCESS_WORKERS", 3)
+    assert api.dna_process_workers() == 3
+
+
+# ============================================================================
+# Sessions shared through Redis
+# ============================================================================
+
+@pytest.fixture
+def redis_server():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeServer()
+
+
+def _worker(monkeypatch, redis_server):
+    """Fresh AppState on a Redis shared with other workers, as after a restart"""
+    import fakeredis
+
+    worker = api.AppState()
+    worker.redis = fakeredis.FakeAsyncRedis(server=redis_server)
+    monkeypatch.setattr(api.app, "state", worker)
+    return worker
+
+
+def test_redis_sessions_survive_a_new_worker(client, monkeypatch, redis_server):
+    _worker(monkeypatch, redis_server)
+    build = _build(client, 5)
+
+    worker = _worker(monkeypatch, redis_server)
+    response = _proof(client, build["session_id"], 2)
+    assert response.status_code == 200
+    assert response.json()["root_hash"] == build["root_hash"]
+    assert build["session_id"] in worker.merkle_sessions  # Cached locally after the Redis load
+
+    appended = _assert_flow(client, build["session_id"], 5)
+
+    _worker(monkeypatch, redis_server)  # The append was written back to Redis
+    response = _proof(client, build["session_id"], 5)
+    assert response.status_code == 200
+    assert response.json()["root_hash"] == appended["root_hash"]
+
+
+def test_redis_build_key_is_shared_between_workers(client, monkeypatch, redis_server):
+    _worker(monkeypatch, redis_server)
+    first = _build(client, 4)
+
+    _worker(monkeypatch, redis_server)
+    assert _build(client, 4)["session_id"] == first["session_id"]
+
+
+def test_redis_reloads_sessions_evicted_locally(client, monkeypatch, redis_server):
+    monkeypatch.setattr(settings, "MERKLE_SESSION_CACHE", 1)
+    worker = _worker(monkeypatch, redis_server)
+    first, second = _build(client, 2), _build(client, 3)
+    assert list(worker.merkle_sessions) == [second["session_id"]]
+
+    response = _proof(client, first["session_id"], 1)
+    assert response.status_code == 200
+    assert response.json()["root_hash"] == first["root_hash"]
+    assert list(worker.merkle_sessions) == [first["session_id"]]
+
+
+def test_redis_skips_lookup_for_forged_session_ids(client, monkeypatch, redis_server):
+    worker = _worker(monkeypatch, redis_server)
+    build = _build(client, 2)
+    forged = build["session_id"][:-8] + "00000000"
+    assert not api.session_id_valid(forged)
+
+    async def fail(*args, **kwargs):
+        raise AssertionError(f"unexpected Redis command {args}")
+
+    monkeypatch.setattr(worker.redis, "execute_command", fail)
+    assert _proof(client, forged, 0).status_code == 404
+
+
+def test_redis_stale_worker_sees_other_workers_append(client, monkeypatch, redis_server):
+    first = _worker(monkeypatch, redis_server)
+    build = _build(client, 4)
+    second = _worker(monkeypatch, redis_server)
+    assert _proof(client, build["session_id"], 0).status_code == 200  # Both workers now hold the tree
+    appended = _append(client, build["session_id"], _dna(0xaa))
+
+    monkeypatch.setattr(api.app, "state", first)  # Still holds the 4-leaf tree locally
+    response = _proof(client, build["session_id"], 4)
+    assert response.status_code == 200
+    assert response.json()["root_hash"] == appended["root_hash"]
+
+    # Appending on the first worker keeps the second worker's leaf
+    again = _append(client, build["session_id"], _dna(0xbb))
+    assert again["leaf_count"] == 6
+    monkeypatch.setattr(api.app, "state", second)
+    assert _proof(client, build["session_id"], 5).json()["root_hash"] == again["root_hash"]
+    assert [leaf.split(b"|")[0] for leaf in second.merkle_sessions[build["session_id"]].leaves[4:]] == [
+        _dna(0xaa).encode(), _dna(0xbb).encode()
+    ]
+
+
+def test_redis_append_resyncs_after_concurrent_append(client, monkeypatch, redis_server):
+    first = _worker(monkeypatch, redis_server)
+    build = _build(client, 3)
+    second = _worker(monkeypatch, redis_server)
+    _append(client, build["session_id"], _dna(0xaa))
+
+    # The first worker appends without having seen the second worker's leaf
+    monkeypatch.setattr(api.app, "state", first)
+    tree = first.merkle_sessions[build["session_id"]]
+    tree.append_leaf(_dna(0xbb), "img_3", "api_platform", 0)
+    synced = api.asyncio.run(first.append_session(build["session_id"], tree))
+
+    assert len(synced.leaves) == 5
+    assert [leaf.split(b"|")[0] for leaf in synced.leaves[3:]] == [_dna(0xaa).encode(), _dna(0xbb).encode()]
+    monkeypatch.setattr(api.app, "state", second)
+    assert _proof(client, build["session_id"], 4).json()["root_hash"] == synced.get_root()
+
+
+def test_redis_stores_leaves_not_pickles(client, monkeypatch, redis_server):
+    worker = _worker(monkeypatch, redis_server)
+    build = _build(client, 3)
+    _append(client, build["session_id"], _dna(0xaa))
+
+    tree = worker.merkle_sessions[build["session_id"]]
+    stored = api.asyncio.run(worker.redis.lrange(f"merkle:{build['session_id']}", 0, -1))
+    assert stored == [str(settings.MERKLE_DIGEST_BYTES).encode(), *tree.leaves]
+
+
+def test_stats_counts_requests_of_all_workers(client, monkeypatch, redis_server):
+    worker = _worker(monkeypatch, redis_server)
+    _build(client, 2)
+    api.asyncio.run(worker.redis.set("stats:requests", 10))
+    assert client.get(f"{settings.API_PREFIX}/stats").json()["request_count_all_workers"] == 11
+
+
+def test_stats_omits_shared_count_when_redis_is_down(client, monkeypatch, redis_server):
+    _worker(monkeypatch, redis_server)
+    _build(client, 2)
+    redis_server.connected = False
+
+    response = client.get(f"{settings.API_PREFIX}/stats")
+    assert response.status_code == 200
+    assert response.json()["request_count"] == 1
+    assert "request_count_all_workers" not in response.json()
@@ -0,0 +1,147 @@
+"""
+Tests for protrace.merkle: incremental appends and multiproofs
+"""
+
+import random
+
+import pytest
+
+from protrace.merkle import MerkleTree
+
+
+def _leaf(i):
+    return (f"{i:064x}", f"img_{i}", "test_platform", 1698765432 + i)
+
+
+def _built_tree(count, digest_size=32):
+    tree = MerkleTree(digest_size=digest_size)
+    for i in range(count):
+        tree.add_leaf(*_leaf(i))
+    tree.build_tree()
+    return tree
+
+
+# ============================================================================
+# Incremental append
+# ============================================================================
+
+@pytest.mark.parametrize("digest_size", [32, 16])
+def test_append_matches_full_rebuild(digest_size):
+    tree = _built_tree(1, digest_size)
+    for count in range(2, 40):
+        root = tree.append_leaf(*_leaf(count - 1))
+        rebuilt = _built_tree(count, digest_size)
+        assert root == rebuilt.get_root()
+        assert tree.levels == rebuilt.levels
+
+
+def test_append_onto_empty_tree_builds():
+    tree = MerkleTree()
+    assert tree.append_leaf(*_leaf(0)) == _built_tree(1).get_root()
+
+
+def test_append_after_unbuilt_add_falls_back_to_rebuild():
+    tree = _built_tree(5)
+    tree.add_leaf(*_leaf(5))  # Not rebuilt, so the retained levels are stale
+    assert tree.append_leaf(*_leaf(6)) == _built_tree(7).get_root()
+
+
+def test_proofs_verify_after_appends():
+    tree = _built_tree(3)
+    for i in range(3, 11):
+        tree.append_leaf(*_leaf(i))
+    root = tree.get_root()
+    for i in range(len(tree.leaves)):
+        assert tree.verify_proof(tree.leaves[i], tree.get_proof(i), root)
+
+
+# ============================================================================
+# Multiproofs
+# ============================================================================
+
+def _verify(tree, indices, multiproof):
+    leaves = {i: tree.leaves[i] for i in indices}
+    return tree.verify_multiproof(leaves, multiproof['proof'], multiproof['leaf_count'], tree.get_root())
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 7, 8, 13, 32, 33])
+def test_multiproof_round_trips_random_index_sets(count):
+    rng = random.Random(count)
+    tree = _built_tree(count)
+    for _ in range(25):
+        indices = rng.sample(range(count), rng.randint(1, count))
+        multiproof = tree.get_multiproof(indices)
+        assert multiproof['leaf_indices'] == sorted(indices)
+        assert multiproof['leaf_count'] == count
+        assert _verify(tree, indices, multiproof)
+
+
+@pytest.mark.parametrize("digest_size", [32, 20])
+def test_multiproof_with_truncated_digests(digest_size):
+    tree = _built_tree(11, digest_size)
+    multiproof = tree.get_multiproof([0, 4, 10])
+    assert all(len(node) == digest_size * 2 for node in multiproof['proof'])
+    assert _verify(tree, [0, 4, 10], multiproof)
+
+
+def test_multiproof_duplicate_indices_are_collapsed():
+    tree = _built_tree(9)
+    multiproof = tree.get_multiproof([3, 8, 3, 8, 8])
+    assert multiproof['leaf_indices'] == [3, 8]
+    assert multiproof == tree.get_multiproof([8, 3])
+    assert _verify(tree, [3, 8], multiproof)
+
+
+def test_multiproof_of_all_leaves_is_empty():
+    tree = _built_tree(7)
+    multiproof = tree.get_multiproof(range(7))
+    assert multiproof['proof'] == []
+    assert _verify(tree, range(7), multiproof)
+
+
+def test_multiproof_raw_matches_hex():
+    tree = _built_tree(21)
+    indices = [1, 6, 7, 20]
+    hex_proof = tree.get_multiproof(indices)
+    raw_proof = tree.get_multiproof(indices, raw=True)
+    assert raw_proof['leaf_indices'] == hex_proof['leaf_indices']
+    assert raw_proof['proof'] == bytes.fromhex(''.join(hex_proof['proof']))
+    assert _verify(tree, indices, raw_proof)
+
+
+@pytest.mark.parametrize("raw", [False, True])
+def test_multiproof_rejects_missing_hash(raw):
+    tree = _built_tree(13)
+    multiproof = tree.get_multiproof([2, 9], raw=raw)
+    multiproof['proof'] = multiproof['proof'][:-32] if raw else multiproof['proof'][:-1]
+    assert not _verify(tree, [2, 9], multiproof)
+
+
+@pytest.mark.parametrize("raw", [False, True])
+def test_multiproof_rejects_surplus_hash(raw):
+    tree = _built_tree(13)
+    multiproof = tree.get_multiproof([2, 9], raw=raw)
+    extra = tree.levels[0][0]
+    multiproof['proof'] = multiproof['proof'] + (extra if raw else [extra.hex()])
+    assert not _verify(tree, [2, 9], multiproof)
+
+
+def test_multiproof_rejects_partial_digest():
+    tree = _built_tree(13)
+    multiproof = tree.get_multiproof([2, 9], raw=True)
+    multiproof['proof'] = multiproof['proof'] + b'\x00'
+    assert not _verify(tree, [2, 9], multiproof)
+
+
+def test_multiproof_rejects_tampered_hash_and_wrong_leaf():
+    tree = _built_tree(10)
+    multiproof = tree.get_multiproof([4])
+    tampered = dict(multiproof, proof=['00' * 32] + multiproof['proof'][1:])
+    assert not _verify(tree, [4], tampered)
+    assert not tree.verify_multiproof({4: tree.leaves[5]}, multiproof['proof'], 10, tree.get_root())
+
+
+def test_multiproof_rejects_out_of_range_index():
+    tree = _built_tree(4)
+    with pytest.raises(IndexError):
+        tree.get_multiproof([4])